@@ -0,0 +1,606 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from utils.lru_cache import LRUCache
+from book.google_books import google_books_breaker
+from utils.circuit_breaker import OPEN
+from utils.exceptions import ExternalAPIException, ServiceUnavailableException
+from utils.frequency import FrequencyTracker
+from utils.metrics import hit_rate, metrics
+from utils.singleflight import AsyncSingleFlight, CacheSingleFlight, SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Stored for IDs that do not exist (or are deleted), so repeated misses skip the database
+MISSING = '__missing__'
+
+def is_shared_cache(cache) -> bool:
+  """Whether a Django cache is shared by every worker, i.e. not stored in the process (locmem, dummy)"""
+  return not isinstance(cache, (LocMemCache, DummyCache))
+
+class BookDetailCache:
+  """
+  Read-through cache of book detail rows, keyed by book ID.
+
+  Backed by the Django cache alias 'books' (MAX_ENTRIES from settings.CACHES).
+  Rows are kept for BOOKS_DETAIL_CACHE_TIMEOUT seconds (0 disables the cache)
+  and missing IDs for BOOKS_CACHE_NEGATIVE_TIMEOUT seconds. Writers must call
+  invalidate() for every book they change.
+
+  invalidate() only reaches other workers when the 'books' cache is shared, so
+  the cache is off by default with a per-process backend, and enabling it there
+  logs a warning.
+  """
+
+  def __init__(self, alias='books'):
+    self.alias = alias
+    self.hits = metrics.counter('books.detail_cache.hits')
+    self.misses = metrics.counter('books.detail_cache.misses')
+    self.negative_hits = metrics.counter('books.detail_cache.negative_hits')
+    self.invalidations = metrics.counter('books.detail_cache.invalidations')
+    metrics.gauge('books.detail_cache.hit_rate', lambda: hit_rate(self.hits, self.misses))
+    if settings.BOOKS_DETAIL_CACHE_TIMEOUT > 0 and not self.is_shared:
+      logger.warning(
+        'BOOKS_DETAIL_CACHE_TIMEOUT is set but the books cache is per process: with several workers, '
+        'a book write does not invalidate the rows other workers cached, which are served for up '
+        'to %s seconds. Point BOOKS_CACHE_BACKEND at a shared cache or set BOOKS_DETAIL_CACHE_TIMEOUT=0.',
+        settings.BOOKS_DETAIL_CACHE_TIMEOUT
+      )
+
+  @property
+  def enabled(self) -> bool:
+    return settings.BOOKS_DETAIL_CACHE_TIMEOUT > 0
+
+  @property
+  def is_shared(self) -> bool:
+    return is_shared_cache(self.cache)
+
+  @property
+  def cache(self):
+    return caches[self.alias]
+
+  def get(self, book_id):
+    """
+    Returns:
+        dict, MISSING or None: Cached row, MISSING for a cached "not found", None on a cache miss
+    """
+    if not self.enabled:
+      return None
+    book_data = self.cache.get(self._key(book_id))
+    if book_data is None:
+      self.misses.incr()
+    elif book_data == MISSING:
+      self.hits.incr()
+      self.negative_hits.incr()
+    else:
+      self.hits.incr()
+    return book_data
+
+  def set(self, book_id, book_data):
+    if self.enabled:
+      self.cache.set(self._key(book_id), book_data, settings.BOOKS_DETAIL_CACHE_TIMEOUT)
+
+  def set_missing(self, book_id):
+    if self.enabled:
+      self.cache.set(self._key(book_id), MISSING, settings.BOOKS_CACHE_NEGATIVE_TIMEOUT)
+
+  def discard_stale(self, book_id, updated_at):
+    """Drop the cached row unless it matches updated_at as just read from the database"""
+    if self.enabled:
+      book_data = self.cache.get(self._key(book_id))
+      if book_data is not None and (book_data == MISSING or book_data.get('updated_at') != updated_at):
+        self.invalidate(book_id)
+
+  def invalidate(self, *book_ids):
+    if book_ids:
+      self.cache.delete_many([self._key(book_id) for book_id in book_ids])
+      self.invalidations.incr(len(book_ids))
+
+  def stats(self) -> dict:
+    return {
+      'hits': self.hits.value,
+      'misses': self.misses.value,
+      'negative_hits': self.negative_hits.value,
+      'invalidations': self.invalidations.value,
+      'hit_rate': hit_rate(self.hits, self.misses),
+    }
+
+  def _key(self, book_id) -> str:
+    return f'book:detail:{book_id}'
+
+book_detail_cache = BookDetailCache()
+
+class CatalogGeneration:
+  """
+  Version number of the whole catalog, bumped by every book write.
+
+  List cache keys include the current generation, so one bump makes every
+  cached list stale at once without scanning or deleting keys. The counter
+  lives in the 'books' Django cache, so with a shared backend a write in one
+  worker invalidates the lists cached by all of them. With a per-process
+  backend (locmem, dummy) it only invalidates the writing worker's lists.
+  """
+
+  key = 'books:generation'
+
+  def __init__(self, alias='books'):
+    self.alias = alias
+
+  @property
+  def cache(self):
+    return caches[self.alias]
+
+  @property
+  def is_shared(self) -> bool:
+    return is_shared_cache(self.cache)
+
+  def current(self) -> int:
+    generation = self.cache.get(self.key)
+    if generation is None:
+      # Start from the clock rather than 1, so a counter lost to eviction or a
+      # restart never comes back at a value older entries were cached under
+      self.cache.add(self.key, time.time_ns(), timeout=None)
+      generation = self.cache.get(self.key)
+    return generation
+
+  def bump(self):
+    try:
+      self.cache.incr(self.key)
+    except ValueError:
+      self.cache.add(self.key, time.time_ns(), timeout=None)
+
+class BookListCache:
+  """
+  In-process cache of get_books pages keyed by the normalized filters
+  (including pagination parameters and fields) and the catalog generation.
+
+  Bounded by BOOKS_LIST_CACHE_MAX_BYTES of pickled results and expired after
+  BOOKS_LIST_CACHE_TIMEOUT seconds. Concurrent misses for the same key are
+  coalesced so only one of them runs the query.
+  Cached pages are shared between requests and must not be mutated.
+
+  Only coherent across workers when the 'books' cache is shared (see
+  CatalogGeneration); enabling it with a per-process backend logs a warning.
+  """
+
+  def __init__(self):
+    self.entries = LRUCache(
+      max_bytes=settings.BOOKS_LIST_CACHE_MAX_BYTES,
+      ttl=settings.BOOKS_LIST_CACHE_TIMEOUT
+    )
+    self.generation = CatalogGeneration()
+    self.flight = SingleFlight()
+    self.hits = metrics.counter('books.list_cache.hits')
+    self.misses = metrics.counter('books.list_cache.misses')
+    metrics.gauge('books.list_cache.hit_rate', lambda: hit_rate(self.hits, self.misses))
+    metrics.gauge('books.list_cache.entries', lambda: len(self.entries))
+    metrics.gauge('books.list_cache.bytes', lambda: self.entries.size_bytes)
+    if settings.BOOKS_LIST_CACHE_TIMEOUT > 0 and not self.generation.is_shared:
+      logger.warning(
+        'BOOKS_LIST_CACHE_TIMEOUT is set but the books cache is per process: with several workers, '
+        'a book write does not invalidate the lists other workers cached, which are served for up '
+        'to %s seconds. Point BOOKS_CACHE_BACKEND at a shared cache or set BOOKS_LIST_CACHE_TIMEOUT=0.',
+        settings.BOOKS_LIST_CACHE_TIMEOUT
+      )
+
+  def get_or_load(self, filters, loader, version=None):
+    """
+    Args:
+        filters: Validated GetBooksDto data
+        loader: Zero-argument callable returning the page on a miss
+        version: Optional fingerprint of the matching rows (e.g. the list ETag), part of
+                 the key, so a page is only reused for the data version it was loaded at
+
+    Returns:
+        dict: The cached or freshly loaded page
+    """
+    if settings.BOOKS_LIST_CACHE_TIMEOUT <= 0:
+      return loader()
+
+    key = self._key(filters, self.generation.current(), version)
+    page = self.entries.get(key)
+    if page is not None:
+      self.hits.incr()
+      return page
+
+    self.misses.incr()
+
+    def load():
+      # Another request may have filled the entry while this one waited
+      cached = self.entries.get(key)
+      if cached is not None:
+        return cached
+      page = loader()
+      self.entries.set(key, page)
+      return page
+
+    return self.flight.do(key, load)
+
+  def invalidate(self):
+    self.generation.bump()
+
+  def _key(self, filters, generation, version=None) -> str:
+    normalized = {name: value for name, value in filters.items() if value not in (None, '', [])}
+    raw = json.dumps([normalized, version], sort_keys=True, default=str)
+    digest = hashlib.sha256(raw.encode('utf-8')).hexdigest()
+    return f'{generation}:{digest}'
+
+book_list_cache = BookListCache()
+
+class GoogleBooksResult:
+  """A Google Books response with how it was served from the cache"""
+
+  def __init__(self, data, cache_status, age=0, max_age=0):
+    self.data = data
+    # HIT, MISS or STALE, sent as X-Cache
+    self.cache_status = cache_status
+    self.age = age
+    self.max_age = max_age
+
+  def headers(self) -> dict:
+    return {
+      'X-Cache': self.cache_status,
+      'Age': str(self.age),
+      'Cache-Control': (
+        f'private, max-age={self.max_age}, '
+        f'stale-while-revalidate={settings.GOOGLE_BOOKS_CACHE_STALE_WHILE_REVALIDATE}, '
+        f'stale-if-error={settings.GOOGLE_BOOKS_CACHE_STALE_IF_ERROR}'
+      ),
+    }
+
+class GoogleBooksCache:
+  """
+  In-process cache of Google Books responses keyed by the normalized query parameters.
+
+  A response is fresh for GOOGLE_BOOKS_CACHE_TIMEOUT seconds. After that it
+  is still served for GOOGLE_BOOKS_CACHE_STALE_WHILE_REVALIDATE seconds while
+  a background thread (or task, on the async path) refreshes it, and for GOOGLE_BOOKS_CACHE_STALE_IF_ERROR
+  seconds when the upstream request fails or its circuit is open.
+  Bounded by entry count and bytes.
+
+  Concurrent upstream calls for the same parameters are coalesced into one:
+  across the threads of a worker always, and across processes too when
+  GOOGLE_BOOKS_COALESCE_CACHE names a shared Django cache alias.
+  """
+
+  def __init__(self):
+    self.entries = LRUCache(
+      max_entries=settings.GOOGLE_BOOKS_CACHE_MAX_ENTRIES,
+      max_bytes=settings.GOOGLE_BOOKS_CACHE_MAX_BYTES,
+      ttl=settings.GOOGLE_BOOKS_CACHE_TIMEOUT + max(
+        settings.GOOGLE_BOOKS_CACHE_STALE_WHILE_REVALIDATE,
+        settings.GOOGLE_BOOKS_CACHE_STALE_IF_ERROR
+      )
+    )
+    self._refreshing = set()
+    self._lock = threading.Lock()
+    self.coalesced = metrics.counter('google_books.coalesced')
+    self.flight = SingleFlight(on_wait=self.coalesced.incr)
+    self.async_flight = AsyncSingleFlight(on_wait=self.coalesced.incr)
+    self._tasks = set()
+    self.shared_flight = None
+    if settings.GOOGLE_BOOKS_COALESCE_CACHE:
+      self.shared_flight = CacheSingleFlight(
+        settings.GOOGLE_BOOKS_COALESCE_CACHE,
+        prefix='google_books:flight',
+        lock_timeout=settings.GOOGLE_BOOKS_COALESCE_LOCK_TIMEOUT,
+        on_wait=self.coalesced.incr
+      )
+    self.hits = metrics.counter('google_books.cache.hits')
+    self.stale_hits = metrics.counter('google_books.cache.stale_hits')
+    self.misses = metrics.counter('google_books.cache.misses')
+    self.refreshes = metrics.counter('google_books.cache.refreshes')
+    self.refresh_errors = metrics.counter('google_books.cache.refresh_errors')
+    metrics.gauge('google_books.cache.hit_rate', lambda: hit_rate(self.hits, self.misses))
+    metrics.gauge('google_books.cache.entries', lambda: len(self.entries))
+    metrics.gauge('google_books.cache.bytes', lambda: self.entries.size_bytes)
+
+  def get_or_fetch(self, params, fetch) -> GoogleBooksResult:
+    """
+    Args:
+        params: Query parameters sent upstream
+        fetch: Zero-argument callable returning the upstream response data
+
+    Returns:
+        GoogleBooksResult: Cached or freshly fetched response
+
+    Raises:
+        ExternalAPIException: If the upstream fails and no usable stale response is cached
+        ServiceUnavailableException: If the upstream circuit is open and no usable stale response is cached
+    """
+    key = self._key(params)
+    timeout = settings.GOOGLE_BOOKS_CACHE_TIMEOUT
+    if timeout <= 0:
+      return GoogleBooksResult(self._fetch(key, fetch, store=False), 'MISS')
+
+    result, entry = self._lookup(key)
+    if result is not None:
+      if result.cache_status == 'STALE':
+        self._refresh_in_background(key, fetch)
+      return result
+
+    self.misses.incr()
+    try:
+      data = self._fetch(key, fetch)
+    except (ExternalAPIException, ServiceUnavailableException):
+      stale = self._stale_if_error(entry)
+      if stale is None:
+        raise
+      return stale
+    return GoogleBooksResult(data, 'MISS', 0, timeout)
+
+  async def aget_or_fetch(self, params, fetch) -> GoogleBooksResult:
+    """
+    Async variant of get_or_fetch(), sharing the same entries.
+    Concurrent misses are coalesced within the event loop (not across processes).
+
+    Args:
+        params: Query parameters sent upstream
+        fetch: Zero-argument callable returning an awaitable of the upstream response data
+    """
+    key = self._key(params)
+    timeout = settings.GOOGLE_BOOKS_CACHE_TIMEOUT
+    if timeout <= 0:
+      return GoogleBooksResult(await self._afetch(key, fetch, store=False), 'MISS')
+
+    result, entry = self._lookup(key)
+    if result is not None:
+      if result.cache_status == 'STALE':
+        self._arefresh_in_background(key, fetch)
+      return result
+
+    self.misses.incr()
+    try:
+      data = await self._afetch(key, fetch)
+    except (ExternalAPIException, ServiceUnavailableException):
+      stale = self._stale_if_error(entry)
+      if stale is None:
+        raise
+      return stale
+    return GoogleBooksResult(data, 'MISS', 0, timeout)
+
+  def refresh_if_expiring(self, params, fetch, lead) -> bool:
+    """
+    Fetch a response ahead of time when it is missing or stops being fresh within lead seconds.
+
+    Returns:
+        bool: Whether an upstream call was made
+
+    Raises:
+        ExternalAPIException, ServiceUnavailableException: If the upstream call fails
+    """
+    key = self._key(params)
+    entry = self.entries.get(key)
+    if entry is not None and time.time() - entry[1] < settings.GOOGLE_BOOKS_CACHE_TIMEOUT - lead:
+      return False
+    self._fetch(key, fetch)
+    return True
+
+  def clear(self):
+    self.entries.clear()
+
+  def _lookup(self, key):
+    """
+    Returns:
+        tuple: (HIT or STALE result to serve, or None on a miss; the cached entry, if any)
+    """
+    entry = self.entries.get(key)
+    if entry is None:
+      return None, None
+
+    data, fetched_at = entry
+    age = int(time.time() - fetched_at)
+    timeout = settings.GOOGLE_BOOKS_CACHE_TIMEOUT
+    if age < timeout:
+      self.hits.incr()
+      return GoogleBooksResult(data, 'HIT', age, timeout - age), entry
+    if age < timeout + settings.GOOGLE_BOOKS_CACHE_STALE_WHILE_REVALIDATE:
+      # Stale hits count as hits too, the hit rate is about upstream calls saved
+      self.hits.incr()
+      self.stale_hits.incr()
+      return GoogleBooksResult(data, 'STALE', age), entry
+    return None, entry
+
+  def _stale_if_error(self, entry):
+    if entry is None:
+      return None
+    data, fetched_at = entry
+    age = int(time.time() - fetched_at)
+    if age >= settings.GOOGLE_BOOKS_CACHE_TIMEOUT + settings.GOOGLE_BOOKS_CACHE_STALE_IF_ERROR:
+      return None
+    self.stale_hits.incr()
+    return GoogleBooksResult(data, 'STALE', age)
+
+  def _fetch(self, key, fetch, store=True):
+    """Call upstream once for all concurrent callers with this key, and cache the response"""
+    def load():
+      data = self.shared_flight.do(key, fetch) if self.shared_flight else fetch()
+      if store:
+        self.entries.set(key, (data, time.time()))
+      return data
+
+    return self.flight.do(key, load)
+
+  async def _afetch(self, key, fetch, store=True):
+    async def load():
+      data = await fetch()
+      if store:
+        self.entries.set(key, (data, time.time()))
+      return data
+
+    return await self.async_flight.do(key, load)
+
+  def _start_refresh(self, key) -> bool:
+    with self._lock:
+      if key in self._refreshing:
+        return False
+      self._refreshing.add(key)
+      return True
+
+  def _end_refresh(self, key, error=None, cancelled=False):
+    if cancelled:
+      # Nothing to count: the refresh was interrupted, a later stale hit starts a new one
+      pass
+    elif error is None:
+      self.refreshes.incr()
+    else:
+      # The stale entry keeps being served until it expires
+      self.refresh_errors.incr()
+      logger.warning('Background refresh of a Google Books response failed', exc_info=error)
+    with self._lock:
+      self._refreshing.discard(key)
+
+  def _refresh_in_background(self, key, fetch):
+    if not self._start_refresh(key):
+      return
+
+    def refresh():
+      error = None
+      try:
+        self._fetch(key, fetch)
+      except Exception as e:
+        error = e
+      finally:
+        self._end_refresh(key, error)
+
+    threading.Thread(target=refresh, name='google-books-refresh', daemon=True).start()
+
+  def _arefresh_in_background(self, key, fetch):
+    if not self._start_refresh(key):
+      return
+
+    async def refresh():
+      error = None
+      cancelled = False
+      try:
+        await self._afetch(key, fetch)
+      except Exception as e:
+        error = e
+      except BaseException:
+        # Cancelled, e.g. the async view ran under a sync server and its per-request loop is closing
+        cancelled = True
+        raise
+      finally:
+        # Always release the key, or it would never be refreshed in the background again
+        self._end_refresh(key, error, cancelled)
+        if cancelled:
+          # Finish the refresh on a thread with a loop of its own
+          self._refresh_in_background(key, lambda: asyncio.run(fetch()))
+
+    # The loop only keeps weak references to tasks
+    task = asyncio.get_running_loop().create_task(refresh())
+    self._tasks.add(task)
+    task.add_done_callback(self._tasks.discard)
+
+  def _key(self, params) -> str:
+    normalized = {name: value for name, value in params.items() if value not in (None, '')}
+    if isinstance(normalized.get('q'), str):
+      normalized['q'] = ' '.join(normalized['q'].split())
+    return json.dumps(normalized, sort_keys=True, default=str)
+
+google_books_cache = GoogleBooksCache()
+
+class GoogleBooksWarmer:
+  """
+  Keeps the most requested Google Books queries warm in GoogleBooksCache.
+
+  get_google_books records every query in a decaying frequency tracker.
+  Every GOOGLE_BOOKS_WARMUP_INTERVAL seconds a background thread refreshes
+  the top GOOGLE_BOOKS_WARMUP_TOP_N queries that are missing or would stop
+  being fresh before the run after next, making at most
+  GOOGLE_BOOKS_WARMUP_BUDGET upstream calls per run, so popular searches are
+  served from a fresh entry instead of waiting on a miss.
+
+  The cache is per process, so each worker warms its own: the thread starts
+  lazily on the first recorded query (never in management commands or
+  migrations) and again in a forked child.
+  """
+
+  def __init__(self, cache, request_for):
+    """
+    Args:
+        cache: The GoogleBooksCache to warm
+        request_for: Callable mapping validated GoogleBooksDto filters to
+                     (cache params, zero-argument fetch callable)
+    """
+    self.cache = cache
+    self.request_for = request_for
+    self.tracker = FrequencyTracker(
+      max_keys=settings.GOOGLE_BOOKS_WARMUP_TRACKED_QUERIES,
+      half_life=settings.GOOGLE_BOOKS_WARMUP_HALF_LIFE
+    )
+    self._pid = None
+    self._lock = threading.Lock()
+    self.runs = metrics.counter('google_books.warmup.runs')
+    self.refreshed = metrics.counter('google_books.warmup.refreshed')
+    self.failed = metrics.counter('google_books.warmup.failed')
+    metrics.gauge('google_books.warmup.tracked_queries', lambda: len(self.tracker))
+
+  @property
+  def enabled(self) -> bool:
+    return settings.GOOGLE_BOOKS_WARMUP_INTERVAL > 0 and settings.GOOGLE_BOOKS_CACHE_TIMEOUT > 0
+
+  def record(self, filters):
+    if not self.enabled:
+      return
+    self.tracker.record(self.cache._key(filters), dict(filters))
+    self._ensure_started()
+
+  def run_once(self) -> dict:
+    """
+    Refresh the popular queries that are about to expire, within the budget.
+
+    Returns:
+        dict: 'refreshed', 'failed' and 'fresh' (already fresh enough) query counts
+    """
+    budget = settings.GOOGLE_BOOKS_WARMUP_BUDGET
+    lead = 2 * settings.GOOGLE_BOOKS_WARMUP_INTERVAL
+    report = {'refreshed': 0, 'failed': 0, 'fresh': 0}
+
+    for _, filters, _ in self.tracker.top(settings.GOOGLE_BOOKS_WARMUP_TOP_N):
+      if report['refreshed'] + report['failed'] >= budget:
+        break
+      params, fetch = self.request_for(filters)
+      try:
+        if self.cache.refresh_if_expiring(params, fetch, lead):
+          report['refreshed'] += 1
+        else:
+          report['fresh'] += 1
+      except (ExternalAPIException, ServiceUnavailableException):
+        report['failed'] += 1
+        if not self._upstream_available():
+          # The circuit opened, leave the remaining budget for the next run
+          break
+
+    self.runs.incr()
+    self.refreshed.incr(report['refreshed'])
+    self.failed.incr(report['failed'])
+    return report
+
+  def _upstream_available(self) -> bool:
+    return google_books_breaker.state != OPEN
+
+  def _ensure_started(self):
+    if self._pid == os.getpid():
+      return
+    with self._lock:
+      if self._pid == os.getpid():
+        return
+      self._pid = os.getpid()
+      threading.Thread(target=self._run_forever, name='google-books-warmup', daemon=True).start()
+
+  def _run_forever(self):
+    while True:
+      time.sleep(settings.GOOGLE_BOOKS_WARMUP_INTERVAL)
+      try:
+        self.run_once()
+      except Exception:
+        logger.exception('Google Books warm-up run failed')
@@ -0,0 +1,61 @@
+from django.conf import settings
+from rest_framework import serializers
+from book.dto.update_book_dto import UpdateBookDto
+
+class BookFilterDto(serializers.Serializer):
+  title = serializers.CharField(
+    required=False,
+    allow_blank=True,
+    help_text='Match books by title (case-insensitive partial match)'
+  )
+  isbn = serializers.CharField(
+    required=False,
+    allow_blank=True,
+    max_length=20,
+    help_text='Match books by ISBN (exact match)'
+  )
+  author = serializers.CharField(
+    required=False,
+    allow_blank=True,
+    help_text='Match books by author (case-insensitive partial match)'
+  )
+  added_by_user = serializers.UUIDField(
+    required=False,
+    allow_null=True,
+    help_text='Match books added by this user ID (UUID)'
+  )
+
+class BatchUpdateBooksDto(serializers.Serializer):
+  ids = serializers.ListField(
+    required=False,
+    child=serializers.IntegerField(min_value=1),
+    min_length=1,
+    max_length=settings.BOOKS_BULK_MAX_ITEMS,
+    help_text='IDs of the books to update (use either ids or filter)'
+  )
+  filter = BookFilterDto(
+    required=False,
+    help_text='Update every book matching these filters (use either ids or filter)'
+  )
+  patch = UpdateBookDto(
+    required=True,
+    help_text='Fields to set on every matched book'
+  )
+
+  def validate(self, data):
+    has_ids = bool(data.get('ids'))
+    has_filter = any(value for value in data.get('filter', {}).values())
+    if has_ids == has_filter:
+      raise serializers.ValidationError('Provide either a non-empty "ids" list or a non-empty "filter", not both')
+    if not data['patch']:
+      raise serializers.ValidationError({'patch': ['At least one field is required']})
+    return data
+
+class BatchDeleteBooksDto(serializers.Serializer):
+  ids = serializers.ListField(
+    required=True,
+    child=serializers.IntegerField(min_value=1),
+    min_length=1,
+    max_length=settings.BOOKS_BULK_MAX_ITEMS,
+    help_text='IDs of the books to soft delete'
+  )
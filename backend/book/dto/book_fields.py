@@ -0,0 +1,25 @@
+from rest_framework import serializers
+
+# Book columns a client can request with the fields parameter
+BOOK_COLUMN_FIELDS = ('id', 'title', 'author', 'description', 'price', 'isbn', 'created_at')
+# Fields describing the user who added the book, read through a join to users
+BOOK_ADDED_BY_FIELDS = ('added_by_user_id', 'added_by_email', 'added_by_name', 'added_by_role')
+BOOK_FIELDS = BOOK_COLUMN_FIELDS + BOOK_ADDED_BY_FIELDS
+
+class BookFieldsField(serializers.CharField):
+  """
+  Comma-separated list of book fields (sparse fieldset), validated against BOOK_FIELDS.
+  Validates to a list of field names in request order, without duplicates.
+  """
+
+  def to_internal_value(self, data):
+    value = super().to_internal_value(data)
+    fields = list(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+
+    unknown = [name for name in fields if name not in BOOK_FIELDS]
+    if unknown:
+      raise serializers.ValidationError(
+        f'Unknown fields: {", ".join(unknown)}. Allowed fields: {", ".join(BOOK_FIELDS)}'
+      )
+
+    return fields
@@ -0,0 +1,17 @@
+from django.conf import settings
+from rest_framework import serializers
+
+class BulkCreateBooksDto(serializers.Serializer):
+  books = serializers.ListField(
+    required=True,
+    child=serializers.DictField(),
+    min_length=1,
+    max_length=settings.BOOKS_BULK_MAX_ITEMS,
+    help_text='Books to create, each with the same fields as a single create (title, author, description, price, isbn)'
+  )
+  batch_size = serializers.IntegerField(
+    required=False,
+    min_value=1,
+    max_value=5000,
+    help_text='Number of rows per INSERT statement (default: BOOKS_BULK_BATCH_SIZE)'
+  )
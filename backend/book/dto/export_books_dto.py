@@ -0,0 +1,30 @@
+from rest_framework import serializers
+
+class ExportBooksDto(serializers.Serializer):
+  output = serializers.ChoiceField(
+    required=False,
+    choices=['ndjson', 'csv'],
+    default='ndjson',
+    help_text='Export format: newline-delimited JSON or CSV (default: ndjson)'
+  )
+  title = serializers.CharField(
+    required=False,
+    allow_blank=True,
+    help_text='Filter by title (case-insensitive partial match)'
+  )
+  isbn = serializers.CharField(
+    required=False,
+    allow_blank=True,
+    max_length=20,
+    help_text='Filter by ISBN (exact match)'
+  )
+  author = serializers.CharField(
+    required=False,
+    allow_blank=True,
+    help_text='Filter by author (case-insensitive partial match)'
+  )
+  added_by_user = serializers.UUIDField(
+    required=False,
+    allow_null=True,
+    help_text='Filter by user ID (UUID) who added the book'
+  )
@@ -0,0 +1,8 @@
+from rest_framework import serializers
+from book.dto.book_fields import BookFieldsField
+
+class GetBookDto(serializers.Serializer):
+  fields = BookFieldsField(
+    required=False,
+    help_text='Comma-separated list of fields to return (e.g. "id,title"). Defaults to all fields'
+  )
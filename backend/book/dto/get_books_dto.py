@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from book.dto.book_fields import BookFieldsField
 import uuid
 
 class GetBooksDto(serializers.Serializer):
@@ -23,3 +24,25 @@ class GetBooksDto(serializers.Serializer):
     allow_null=True,
     help_text='Filter by user ID (UUID) who added the book'
   )
+  limit = serializers.IntegerField(
+    required=False,
+    min_value=1,
+    max_value=100,
+    default=20,
+    help_text='Maximum number of books per page (1-100, default: 20)'
+  )
+  cursor = serializers.CharField(
+    required=False,
+    allow_blank=True,
+    help_text='Opaque cursor from the "next" or "prev" field of a previous page'
+  )
+  q = serializers.CharField(
+    required=False,
+    allow_blank=True,
+    max_length=255,
+    help_text='Full-text search over title, author and description, results ordered by relevance'
+  )
+  fields = BookFieldsField(
+    required=False,
+    help_text='Comma-separated list of fields to return (e.g. "id,title"). Defaults to all fields'
+  )
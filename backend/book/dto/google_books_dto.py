@@ -44,3 +44,12 @@ class GoogleBooksDto(serializers.Serializer):
         choices=['full', 'lite'],
         help_text='Restrict information returned to a set of selected fields (default: full)'
     )
+    mode = serializers.ChoiceField(
+        required=False,
+        choices=['full', 'trimmed', 'passthrough'],
+        default='full',
+        help_text=(
+            'Response mode (not sent to Google): full (default), trimmed (only the configured volume fields, '
+            'projection defaults to lite when they allow it) or passthrough (upstream JSON bytes relayed unchanged)'
+        )
+    )
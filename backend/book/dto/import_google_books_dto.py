@@ -0,0 +1,29 @@
+from rest_framework import serializers
+
+class ImportGoogleBooksDto(serializers.Serializer):
+  q = serializers.CharField(
+    required=True,
+    help_text='Google Books search query whose results are imported. Examples: "flowers", "inauthor:keyes"'
+  )
+  max_items = serializers.IntegerField(
+    required=False,
+    min_value=1,
+    max_value=1000,
+    help_text='Maximum number of volumes to fetch (1-1000, default: GOOGLE_BOOKS_IMPORT_MAX_ITEMS)'
+  )
+  workers = serializers.IntegerField(
+    required=False,
+    min_value=1,
+    max_value=16,
+    help_text='Number of result pages fetched concurrently (1-16, default: GOOGLE_BOOKS_IMPORT_WORKERS)'
+  )
+  printType = serializers.ChoiceField(
+    required=False,
+    choices=['all', 'books', 'magazines'],
+    help_text='Restrict to books or magazines (default: all)'
+  )
+  langRestrict = serializers.CharField(
+    required=False,
+    max_length=10,
+    help_text='Restrict results to books with this language code (e.g., "en", "es", "fr")'
+  )
@@ -0,0 +1,64 @@
+import csv
+import json
+from rest_framework.utils.encoders import JSONEncoder
+
+# Rendered rows are joined into chunks of roughly this size before being handed
+# to the WSGI server, so each row does not become its own write
+STREAM_BUFFER_SIZE = 64 * 1024
+
+EXPORT_CONTENT_TYPES = {
+  'ndjson': 'application/x-ndjson',
+  'csv': 'text/csv; charset=utf-8',
+}
+
+class _EchoBuffer:
+  """File-like object whose write() returns the value, so csv.writer renders a single row"""
+
+  def write(self, value):
+    return value
+
+def _buffered(lines):
+  buffer = []
+  size = 0
+  for line in lines:
+    buffer.append(line)
+    size += len(line)
+    if size >= STREAM_BUFFER_SIZE:
+      yield ''.join(buffer)
+      buffer = []
+      size = 0
+  if buffer:
+    yield ''.join(buffer)
+
+def render_ndjson(rows):
+  """
+  Render book rows as newline-delimited JSON, one object per line, with values
+  encoded as in the list response (full-precision ISO 8601 datetimes)
+
+  Args:
+      rows: Iterable of book dicts (e.g. a server-side cursor iterator)
+
+  Yields:
+      str: Chunks of NDJSON text
+  """
+  return _buffered(json.dumps(row, cls=JSONEncoder) + '\n' for row in rows)
+
+def render_csv(rows, fields):
+  """
+  Render book rows as CSV with a header line
+
+  Args:
+      rows: Iterable of book dicts (e.g. a server-side cursor iterator)
+      fields: Column names, in order
+
+  Yields:
+      str: Chunks of CSV text
+  """
+  writer = csv.DictWriter(_EchoBuffer(), fieldnames=fields)
+
+  def lines():
+    yield writer.writeheader()
+    for row in rows:
+      yield writer.writerow(row)
+
+  return _buffered(lines())
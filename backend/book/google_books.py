@@ -0,0 +1,344 @@
+import asyncio
+import random
+import threading
+import time
+import httpx
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from utils.circuit_breaker import CircuitBreaker
+
+# Upstream statuses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Largest maxResults the volumes API accepts
+MAX_PAGE_SIZE = 40
+# Volume fields Google still returns with projection=lite (a subset of volumeInfo plus the volume's identity)
+LITE_VOLUME_FIELDS = frozenset([
+  'id', 'kind', 'etag', 'selfLink',
+  'volumeInfo/title', 'volumeInfo/subtitle', 'volumeInfo/authors', 'volumeInfo/publisher',
+  'volumeInfo/publishedDate', 'volumeInfo/description', 'volumeInfo/imageLinks',
+  'volumeInfo/previewLink', 'volumeInfo/infoLink', 'volumeInfo/canonicalVolumeLink',
+])
+
+def is_upstream_failure(error) -> bool:
+  """
+  Whether an error (from requests or httpx) means the upstream is unhealthy.
+  Client errors such as a bad query do not.
+  """
+  if isinstance(error, (requests.exceptions.HTTPError, httpx.HTTPStatusError)) and error.response is not None:
+    return error.response.status_code in RETRY_STATUSES
+  return isinstance(error, (requests.exceptions.RequestException, httpx.TransportError))
+
+def backoff_delay(attempt, response) -> float:
+  """Seconds to wait before retry number attempt + 1: Retry-After when given, else jittered exponential"""
+  if response is not None:
+    retry_after = response.headers.get('Retry-After')
+    if retry_after and retry_after.isdigit():
+      return float(retry_after)
+  # Jitter keeps workers that failed together from retrying together
+  return settings.GOOGLE_BOOKS_RETRY_BACKOFF * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+google_books_breaker = CircuitBreaker(
+  'google_books',
+  failure_threshold=settings.GOOGLE_BOOKS_BREAKER_FAILURE_THRESHOLD,
+  recovery_timeout=settings.GOOGLE_BOOKS_BREAKER_RECOVERY_TIMEOUT,
+  half_open_max_calls=settings.GOOGLE_BOOKS_BREAKER_HALF_OPEN_MAX_CALLS,
+  is_failure=is_upstream_failure
+)
+
+class GoogleBooksClient:
+  """
+  HTTP client for the Google Books volumes API.
+
+  Keeps one requests.Session per process, so connections to googleapis.com
+  are pooled and kept alive between requests instead of paying a TCP+TLS
+  handshake on every call. The pool size, connect/read timeouts and retry
+  policy come from the GOOGLE_BOOKS_* settings.
+
+  Every call has a deadline of GOOGLE_BOOKS_DEADLINE seconds covering all of
+  its attempts: each attempt's timeouts are capped by the time left, and a
+  retry is only made if its backoff (exponential, honouring Retry-After)
+  fits in it. Calls go through a circuit breaker, so while the upstream keeps
+  failing they raise CircuitOpenError immediately instead of holding a
+  worker for the whole deadline.
+  """
+
+  def __init__(self, base_url=None):
+    self.base_url = base_url or settings.GOOGLE_BOOKS_API_URL
+    self.breaker = google_books_breaker
+    self._session = None
+    self._lock = threading.Lock()
+
+  @property
+  def session(self) -> requests.Session:
+    # Created lazily so forked workers do not share a parent's sockets
+    if self._session is None:
+      with self._lock:
+        if self._session is None:
+          self._session = self._build_session()
+    return self._session
+
+  def search_volumes(self, params) -> dict:
+    """
+    Search volumes.
+
+    Args:
+        params: Query parameters forwarded to /volumes
+
+    Returns:
+        dict: Decoded JSON response
+
+    Raises:
+        CircuitOpenError: If the circuit is open after repeated upstream failures
+        requests.exceptions.RequestException: If the request fails after retries,
+            runs out of time, or the final response has an error status
+    """
+    return self.breaker.call(lambda: self._get(params).json())
+
+  def search_volumes_raw(self, params) -> bytes:
+    """Search volumes and return the JSON body undecoded (see search_volumes)"""
+    return self.breaker.call(lambda: self._get(params).content)
+
+  def close(self):
+    with self._lock:
+      if self._session is not None:
+        self._session.close()
+        self._session = None
+
+  def _get(self, params) -> requests.Response:
+    deadline = time.monotonic() + settings.GOOGLE_BOOKS_DEADLINE
+    attempt = 0
+    while True:
+      remaining = deadline - time.monotonic()
+      if remaining <= 0:
+        raise requests.exceptions.Timeout(f'Google Books deadline of {settings.GOOGLE_BOOKS_DEADLINE}s exceeded')
+
+      timeout = (
+        min(settings.GOOGLE_BOOKS_CONNECT_TIMEOUT, remaining),
+        min(settings.GOOGLE_BOOKS_READ_TIMEOUT, remaining)
+      )
+      try:
+        response = self.session.get(self.base_url, params=params, timeout=timeout)
+        response.raise_for_status()
+        return response
+      except requests.exceptions.RequestException as e:
+        retryable = is_upstream_failure(e)
+        if not retryable or attempt >= settings.GOOGLE_BOOKS_MAX_RETRIES:
+          raise
+        delay = backoff_delay(attempt, getattr(e, 'response', None))
+        if time.monotonic() + delay >= deadline:
+          raise
+        time.sleep(delay)
+        attempt += 1
+
+  def _build_session(self) -> requests.Session:
+    adapter = HTTPAdapter(
+      pool_connections=1,
+      pool_maxsize=settings.GOOGLE_BOOKS_POOL_SIZE,
+      # Retries are made by _get, within the call's deadline
+      max_retries=0,
+    )
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'Accept': 'application/json', 'Accept-Encoding': 'gzip'})
+    return session
+
+class AsyncGoogleBooksClient:
+  """
+  asyncio counterpart of GoogleBooksClient for async views under ASGI.
+
+  One httpx.AsyncClient per event loop pools up to
+  GOOGLE_BOOKS_ASYNC_MAX_CONNECTIONS connections, so a single worker can
+  keep hundreds of upstream requests in flight without a thread each.
+  Timeouts, deadline, retries and the circuit breaker (shared with the sync
+  client) behave the same as in GoogleBooksClient.
+
+  Each client lives exactly as long as its loop: a task parked on the loop
+  closes it when the loop cancels its remaining tasks at shutdown, as
+  asyncio.run() and asgiref do. Under ASGI that is the server's one loop;
+  when a sync server runs the async view on a new loop per request, each
+  request's client and connections are closed with its loop.
+  """
+
+  def __init__(self, base_url=None):
+    self.base_url = base_url or settings.GOOGLE_BOOKS_API_URL
+    self.breaker = google_books_breaker
+    self._clients = {}  # event loop -> (AsyncClient, task closing it)
+    self._lock = threading.Lock()
+
+  @property
+  def client(self) -> httpx.AsyncClient:
+    # An AsyncClient is bound to the event loop it was first used on
+    loop = asyncio.get_running_loop()
+    with self._lock:
+      entry = self._clients.get(loop)
+      if entry is None:
+        # Loops closed without cancelling their tasks never ran the closer, drop their clients
+        for closed_loop in [other for other in self._clients if other.is_closed()]:
+          del self._clients[closed_loop]
+        client = self._build_client()
+        closer = loop.create_task(self._close_with_loop(loop, client))
+        entry = self._clients[loop] = (client, closer)
+    return entry[0]
+
+  async def search_volumes(self, params) -> dict:
+    """
+    Search volumes.
+
+    Args:
+        params: Query parameters forwarded to /volumes
+
+    Returns:
+        dict: Decoded JSON response
+
+    Raises:
+        CircuitOpenError: If the circuit is open after repeated upstream failures
+        httpx.HTTPError: If the request fails after retries, runs out of time,
+            or the final response has an error status
+    """
+    response = await self.breaker.acall(lambda: self._get(params))
+    return response.json()
+
+  async def search_volumes_raw(self, params) -> bytes:
+    """Search volumes and return the JSON body undecoded (see search_volumes)"""
+    response = await self.breaker.acall(lambda: self._get(params))
+    return response.content
+
+  async def aclose(self):
+    """Close the current event loop's client now instead of at loop shutdown"""
+    with self._lock:
+      entry = self._clients.get(asyncio.get_running_loop())
+    if entry is not None:
+      closer = entry[1]
+      closer.cancel()
+      await asyncio.gather(closer, return_exceptions=True)
+
+  async def _close_with_loop(self, loop, client):
+    try:
+      # Parked until cancelled by aclose() or by the loop shutting down
+      await loop.create_future()
+    finally:
+      with self._lock:
+        if self._clients.get(loop, (None,))[0] is client:
+          del self._clients[loop]
+      await client.aclose()
+
+  async def _get(self, params) -> httpx.Response:
+    deadline = time.monotonic() + settings.GOOGLE_BOOKS_DEADLINE
+    attempt = 0
+    while True:
+      remaining = deadline - time.monotonic()
+      if remaining <= 0:
+        raise httpx.TimeoutException(f'Google Books deadline of {settings.GOOGLE_BOOKS_DEADLINE}s exceeded')
+
+      timeout = httpx.Timeout(
+        min(settings.GOOGLE_BOOKS_READ_TIMEOUT, remaining),
+        connect=min(settings.GOOGLE_BOOKS_CONNECT_TIMEOUT, remaining)
+      )
+      try:
+        response = await self.client.get(self.base_url, params=params, timeout=timeout)
+        response.raise_for_status()
+        return response
+      except httpx.HTTPError as e:
+        if not is_upstream_failure(e) or attempt >= settings.GOOGLE_BOOKS_MAX_RETRIES:
+          raise
+        delay = backoff_delay(attempt, getattr(e, 'response', None))
+        if time.monotonic() + delay >= deadline:
+          raise
+        await asyncio.sleep(delay)
+        attempt += 1
+
+  def _build_client(self) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+      limits=httpx.Limits(
+        max_connections=settings.GOOGLE_BOOKS_ASYNC_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.GOOGLE_BOOKS_POOL_SIZE
+      ),
+      headers={'Accept': 'application/json', 'Accept-Encoding': 'gzip'},
+    )
+
+def trimmed_params(params, volume_fields=None) -> dict:
+  """
+  Query parameters asking Google to return only the given volume fields
+  (partial response through the fields parameter). projection defaults to
+  lite when every field is available in it, which shrinks the upstream work
+  and payload further.
+
+  Args:
+      params: Volumes query parameters
+      volume_fields: Volume field paths, e.g. ['id', 'volumeInfo/title']
+                     (default: GOOGLE_BOOKS_TRIMMED_FIELDS)
+
+  Returns:
+      dict: A copy of params with fields (and possibly projection) set
+  """
+  volume_fields = volume_fields or settings.GOOGLE_BOOKS_TRIMMED_FIELDS
+  trimmed = dict(params, fields=f"kind,totalItems,items({','.join(volume_fields)})")
+  if 'projection' not in trimmed and all(is_lite_field(path) for path in volume_fields):
+    trimmed['projection'] = 'lite'
+  return trimmed
+
+def is_lite_field(path) -> bool:
+  # volumeInfo/imageLinks/thumbnail is lite because volumeInfo/imageLinks is
+  parts = path.split('/')
+  return any('/'.join(parts[:depth]) in LITE_VOLUME_FIELDS for depth in range(1, len(parts) + 1))
+
+def isbn10_to_isbn13(isbn10):
+  core = '978' + isbn10[:9]
+  check = (10 - sum(int(digit) * (3 if i % 2 else 1) for i, digit in enumerate(core)) % 10) % 10
+  return core + str(check)
+
+def isbn13_to_isbn10(isbn13):
+  # Only 978-prefixed ISBN-13s have an ISBN-10 form
+  if not isbn13.startswith('978'):
+    return None
+  core = isbn13[3:12]
+  check = (11 - sum(int(digit) * (10 - i) for i, digit in enumerate(core)) % 11) % 11
+  return core + ('X' if check == 10 else str(check))
+
+def volume_isbns(volume):
+  """
+  Every ISBN form of a volume: its listed ISBN-13/ISBN-10 identifiers plus their conversions.
+
+  Returns:
+      tuple: (preferred ISBN to store (ISBN-13 when known) or None, set of all forms)
+  """
+  identifiers = {
+    identifier.get('type'): identifier.get('identifier', '').replace('-', '').upper()
+    for identifier in volume.get('volumeInfo', {}).get('industryIdentifiers', [])
+  }
+  isbn13 = identifiers.get('ISBN_13') or None
+  isbn10 = identifiers.get('ISBN_10') or None
+  if isbn13 and not (len(isbn13) == 13 and isbn13.isdigit()):
+    isbn13 = None
+  if isbn10 and not (len(isbn10) == 10 and isbn10[:9].isdigit()):
+    isbn10 = None
+  if isbn10 and not isbn13:
+    isbn13 = isbn10_to_isbn13(isbn10)
+  if isbn13 and not isbn10:
+    isbn10 = isbn13_to_isbn10(isbn13)
+
+  forms = {isbn for isbn in (isbn13, isbn10) if isbn}
+  return isbn13 or isbn10, forms
+
+def volume_to_book(volume, isbn) -> dict:
+  """
+  Map a volume to CreateBookDto fields.
+  Volumes without a list price (not for sale) are imported at 0.00.
+  """
+  info = volume.get('volumeInfo', {})
+  price = volume.get('saleInfo', {}).get('listPrice', {}).get('amount', 0)
+  title = info.get('title', '')
+  if info.get('subtitle'):
+    title = f"{title}: {info['subtitle']}"
+  return {
+    'title': title[:255],
+    'author': ', '.join(info.get('authors') or ['Unknown'])[:255],
+    'description': info.get('description'),
+    'price': f'{price:.2f}',
+    'isbn': isbn,
+  }
+
+google_books_client = GoogleBooksClient()
+async_google_books_client = AsyncGoogleBooksClient()
@@ -0,0 +1,88 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from book.google_books import async_google_books_client, google_books_client
+from book.management.stub_server import StubGoogleBooksHandler, start_stub_server
+from book.services import BookService
+
+
+class Command(BaseCommand):
+  help = (
+    'Compare concurrent throughput of the sync (thread per request) and async (event loop) '
+    'Google Books service paths against a local stub server with fixed latency. '
+    'The response cache is disabled so every request goes upstream.'
+  )
+
+  def add_arguments(self, parser):
+    parser.add_argument('--requests', type=int, default=500, help='Requests per path')
+    parser.add_argument('--concurrency', type=int, default=200, help='Requests in flight on the async path')
+    parser.add_argument(
+      '--threads', type=int, default=8,
+      help='Worker threads on the sync path, i.e. the requests one WSGI worker serves at once'
+    )
+    parser.add_argument('--latency', type=float, default=0.1, help='Stub server response delay in seconds')
+
+  def handle(self, *args, **options):
+    StubGoogleBooksHandler.latency = options['latency']
+    server, url = start_stub_server(StubGoogleBooksHandler)
+
+    sync_base_url = google_books_client.base_url
+    async_base_url = async_google_books_client.base_url
+    google_books_client.base_url = url
+    async_google_books_client.base_url = url
+    google_books_client.close()
+    try:
+      with override_settings(
+        GOOGLE_BOOKS_CACHE_TIMEOUT=0,
+        GOOGLE_BOOKS_POOL_SIZE=options['threads'],
+      ):
+        self._report('sync', self._run_sync(options['requests'], options['threads']))
+        self._report('async', asyncio.run(self._run_async(options['requests'], options['concurrency'])))
+    finally:
+      google_books_client.close()
+      google_books_client.base_url = sync_base_url
+      async_google_books_client.base_url = async_base_url
+      server.shutdown()
+
+  def _run_sync(self, total, threads):
+    service = BookService()
+
+    def timed(index):
+      started = time.perf_counter()
+      # Distinct queries, so single-flight does not merge requests
+      service.get_google_books({'q': f'benchmark {index}'})
+      return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+      latencies = list(pool.map(timed, range(total)))
+    return time.perf_counter() - started, latencies
+
+  async def _run_async(self, total, concurrency):
+    service = BookService()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed(index):
+      async with semaphore:
+        started = time.perf_counter()
+        await service.aget_google_books({'q': f'benchmark {index}'})
+        return time.perf_counter() - started
+
+    try:
+      started = time.perf_counter()
+      latencies = await asyncio.gather(*(timed(index) for index in range(total)))
+      return time.perf_counter() - started, latencies
+    finally:
+      await async_google_books_client.aclose()
+
+  def _report(self, name, run):
+    elapsed, latencies = run
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    self.stdout.write(
+      f'{name:>5}: {len(latencies)} requests in {elapsed:.2f}s = {len(latencies) / elapsed:.1f} req/s, '
+      f'p50 {statistics.median(latencies) * 1000:.0f}ms, p99 {p99 * 1000:.0f}ms'
+    )
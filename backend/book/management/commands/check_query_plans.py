@@ -0,0 +1,186 @@
+import json
+import uuid
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from book.models import Book
+from book.services import BookService, books_paginator
+from user.models import User, UserRole
+
+
+class Command(BaseCommand):
+  help = (
+    'EXPLAIN the main BookService and UserService queries and fail if any of them '
+    'stops being served by its index (or a cursor page stops seeking into it), then check '
+    'that paging through full-text search results with tied ranks returns every row once. '
+    'Run it in CI against a migrated PostgreSQL database.'
+  )
+
+  # Rows inserted (and rolled back) by the tied-rank pagination check, and its page size
+  RANKED_ROWS = 9
+  RANKED_PAGE_SIZE = 2
+
+  def handle(self, *args, **options):
+    if connection.vendor != 'postgresql':
+      raise CommandError('Query plan checks require PostgreSQL')
+
+    book_service = BookService()
+    failures = []
+    with transaction.atomic():
+      with connection.cursor() as cursor:
+        # Small tables make sequential scans cheapest, disable them so the plan
+        # shows whether an index is able to serve the query at all
+        cursor.execute('SET LOCAL enable_seqscan = off')
+
+      for name, queryset, expected_indexes, seek_column in self.plan_checks(book_service):
+        error = self.plan_error(queryset, expected_indexes, seek_column)
+        if error:
+          failures.append(name)
+          self.stdout.write(self.style.ERROR(f'FAIL  {name}: {error}'))
+        else:
+          self.stdout.write(self.style.SUCCESS(f'OK    {name}'))
+
+    if not self.check_ranked_pagination(book_service):
+      failures.append('ranked pagination')
+
+    if failures:
+      raise CommandError(f'{len(failures)} query plan check(s) failed')
+
+  def plan_checks(self, book_service) -> list:
+    """(name, queryset, indexes of which one must be used, column the index scan must seek on) per query"""
+    return [
+      (
+        'books list (newest first)',
+        book_service.get_books_queryset({}).order_by('-created_at', '-id')[:21],
+        ['books_live_created_idx'],
+        None,
+      ),
+      (
+        'books list page after a cursor',
+        book_service.get_books_queryset({})
+        .filter(books_paginator._seek_filter([timezone.now().isoformat(), 1], 'next'))
+        .order_by('-created_at', '-id')[:21],
+        ['books_live_created_idx'],
+        'created_at',
+      ),
+      (
+        'books list filtered by added_by_user',
+        book_service.get_books_queryset({'added_by_user': uuid.uuid4()}).order_by('-created_at', '-id')[:21],
+        ['books_live_added_by_idx'],
+        None,
+      ),
+      (
+        'books list filtered by title',
+        book_service.get_books_queryset({'title': 'tolkien'}),
+        ['books_title_trgm_idx'],
+        None,
+      ),
+      (
+        'books list filtered by author',
+        book_service.get_books_queryset({'author': 'tolkien'}),
+        ['books_author_trgm_idx'],
+        None,
+      ),
+      (
+        'books full-text search',
+        book_service.get_books_queryset({'q': 'tolkien'}),
+        ['books_search_vector_idx'],
+        None,
+      ),
+      (
+        'book by id',
+        Book.objects.filter(id=1, deleted_at=None),
+        ['books_pkey'],
+        None,
+      ),
+      (
+        'user by email',
+        User.objects.filter(email='reader@example.com', deleted_at=None),
+        ['users_live_email_idx', 'users_email_key'],
+        None,
+      ),
+    ]
+
+  def plan_error(self, queryset, expected_indexes, seek_column=None):
+    """EXPLAIN the queryset and return what is wrong with its plan, or None if it uses an expected index"""
+    plan = json.loads(queryset.explain(format='json'))[0]['Plan']
+    used_indexes = self._collect_indexes(plan)
+    if not used_indexes & set(expected_indexes):
+      used = ', '.join(sorted(used_indexes)) or 'no index'
+      return f'expected {" or ".join(expected_indexes)}, plan uses {used}'
+    index_conds = self._collect_index_conds(plan)
+    if seek_column and not any(seek_column in cond for cond in index_conds):
+      # Without an Index Cond the scan reads from the start of the index and filters
+      return f'expected an Index Cond on {seek_column}, plan has {index_conds or "none"}'
+    return None
+
+  def check_ranked_pagination(self, book_service) -> bool:
+    """
+    Walk search results forward and back in small pages over rows whose ranks tie
+    in groups, and check each direction returns every row exactly once in order.
+    Catches cursors whose rank does not round-trip (e.g. a float4 ts_rank).
+    """
+    token = f'plancheck{uuid.uuid4().hex[:12]}'
+    with transaction.atomic():
+      user = User.objects.create(
+        email=f'{token}@example.com', name='Query plan check', password='!', role=UserRole.MANAGER
+      )
+      # Three groups of equal rank: token in the title only, in title and author, in all three
+      Book.objects.bulk_create([
+        Book(
+          title=f'{token} volume {index}',
+          author=f'{token} author' if index % 3 else 'Someone',
+          description=f'About {token}' if index % 3 == 2 else None,
+          price=1,
+          added_by=user,
+        )
+        for index in range(self.RANKED_ROWS)
+      ])
+
+      expected = [row['id'] for row in book_service._load_books_page({'q': token, 'limit': self.RANKED_ROWS})['results']]
+      forward_pages = self._walk(book_service, token, None, 'next')
+      # Back from the last page to the first
+      backward_pages = self._walk(book_service, token, forward_pages[-1][1], 'prev')
+      transaction.set_rollback(True)
+
+    forward = [book_id for ids, _ in forward_pages for book_id in ids]
+    backward = [book_id for ids, _ in reversed(backward_pages) for book_id in ids]
+    last_page = forward_pages[-1][0]
+    ok = (
+      len(expected) == self.RANKED_ROWS and
+      forward == expected and
+      backward + last_page == expected
+    )
+    if ok:
+      self.stdout.write(self.style.SUCCESS(f'OK    ranked pagination: {len(expected)} rows with tied ranks'))
+    else:
+      self.stdout.write(self.style.ERROR(
+        f'FAIL  ranked pagination: expected {expected}, forward {forward}, backward {backward + last_page}'
+      ))
+    return ok
+
+  def _walk(self, book_service, token, cursor, direction) -> list:
+    """Follow cursors in one direction, returning (IDs, prev cursor) per page in walk order"""
+    pages = []
+    while cursor or not pages:
+      page = book_service._load_books_page({'q': token, 'limit': self.RANKED_PAGE_SIZE, 'cursor': cursor})
+      pages.append(([row['id'] for row in page['results']], page['prev']))
+      cursor = page[direction]
+      # Guards against a cursor loop, which is itself a failure the ID comparison reports
+      if len(pages) > self.RANKED_ROWS:
+        break
+    return pages
+
+  def _collect_indexes(self, node) -> set:
+    indexes = set()
+    if 'Index Name' in node:
+      indexes.add(node['Index Name'])
+    for child in node.get('Plans', []):
+      indexes |= self._collect_indexes(child)
+    return indexes
+
+  def _collect_index_conds(self, node) -> list:
+    conds = [node['Index Cond']] if 'Index Cond' in node else []
+    for child in node.get('Plans', []):
+      conds += self._collect_index_conds(child)
+    return conds
@@ -0,0 +1,56 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from book.services import BookService
+from user.models import User, UserRole
+from utils.exceptions import BaseAPIException
+
+
+class Command(BaseCommand):
+  help = (
+    'Import Google Books search results into the books table: pages are fetched in parallel, '
+    'volumes already in the catalog (by ISBN-13/ISBN-10) are skipped and the rest are bulk inserted.'
+  )
+
+  def add_arguments(self, parser):
+    parser.add_argument('query', help='Google Books search query, e.g. "inauthor:tolkien"')
+    parser.add_argument('--user', required=True, help='Email of the admin recorded as adding the books')
+    parser.add_argument(
+      '--max-items', type=int, default=settings.GOOGLE_BOOKS_IMPORT_MAX_ITEMS,
+      help='Maximum number of volumes to fetch'
+    )
+    parser.add_argument(
+      '--workers', type=int, default=settings.GOOGLE_BOOKS_IMPORT_WORKERS,
+      help='Number of result pages fetched concurrently'
+    )
+    parser.add_argument('--lang', help='Restrict results to a language code (langRestrict)')
+    parser.add_argument('--print-type', choices=['all', 'books', 'magazines'], help='printType filter')
+
+  def handle(self, *args, **options):
+    user = User.objects.filter(email=options['user'], deleted_at=None).values('id', 'role').first()
+    if user is None:
+      raise CommandError(f'No user with email {options["user"]}')
+    if user['role'] != UserRole.ADMIN:
+      raise CommandError('Books can only be imported on behalf of an admin')
+
+    try:
+      report = BookService().import_google_books(
+        options['query'],
+        str(user['id']),
+        max_items=options['max_items'],
+        workers=options['workers'],
+        params={'langRestrict': options['lang'], 'printType': options['print_type']}
+      )
+    except BaseAPIException as e:
+      raise CommandError(str(e.detail))
+
+    skipped = report['skipped']
+    self.stdout.write(
+      f'Fetched {report["volumes_fetched"]} volumes from {report["pages_fetched"]} pages '
+      f'({report["pages_failed"]} failed) in {report["elapsed_seconds"]}s, '
+      f'{report["volumes_per_second"]} volumes/s'
+    )
+    self.stdout.write(
+      f'Skipped {sum(skipped.values())}: {skipped["existing"]} already in the catalog, '
+      f'{skipped["duplicate"]} duplicates, {skipped["no_isbn"]} without ISBN, {skipped["invalid"]} invalid'
+    )
+    self.stdout.write(self.style.SUCCESS(f'Created {report["created"]} books'))
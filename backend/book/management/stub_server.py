@@ -0,0 +1,48 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubGoogleBooksHandler(BaseHTTPRequestHandler):
+  """Answers every volumes request with a fixed payload after a fixed delay, over keep-alive connections"""
+  protocol_version = 'HTTP/1.1'
+  latency = 0.1
+  body = json.dumps({
+    'kind': 'books#volumes',
+    'totalItems': 1,
+    'items': [{'id': 'stub', 'volumeInfo': {'title': 'Stub', 'authors': ['Stub Author']}}],
+  }).encode('utf-8')
+
+  def do_GET(self):
+    time.sleep(self.latency)
+    self.send_response(200)
+    self.send_header('Content-Type', 'application/json')
+    self.send_header('Content-Length', str(len(self.body)))
+    self.end_headers()
+    self.wfile.write(self.body)
+
+  def log_message(self, format, *args):
+    pass
+
+
+class StubServer(ThreadingHTTPServer):
+  daemon_threads = True
+  # Room for every connection the async path opens at once
+  request_queue_size = 1024
+
+  def handle_error(self, request, client_address):
+    # Clients that time out close the connection mid-response, which is expected here
+    pass
+
+
+def start_stub_server(handler_class):
+  """
+  Serve handler_class on a free local port from a daemon thread.
+
+  Returns:
+      tuple: (server, volumes URL); call server.shutdown() when done
+  """
+  server = StubServer(('127.0.0.1', 0), handler_class)
+  threading.Thread(target=server.serve_forever, daemon=True).start()
+  return server, f'http://127.0.0.1:{server.server_address[1]}/books/v1/volumes'
@@ -0,0 +1,34 @@
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations
+from utils.models.operations import PostgreSQLOnly
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("book", "0001_initial"),
+    ]
+
+    operations = [
+        PostgreSQLOnly(TrigramExtension()),
+        PostgreSQLOnly(
+            AddIndexConcurrently(
+                model_name="book",
+                index=django.contrib.postgres.indexes.GinIndex(
+                    fields=["title"], name="books_title_trgm_idx", opclasses=["gin_trgm_ops"]
+                ),
+            )
+        ),
+        PostgreSQLOnly(
+            AddIndexConcurrently(
+                model_name="book",
+                index=django.contrib.postgres.indexes.GinIndex(
+                    fields=["author"], name="books_author_trgm_idx", opclasses=["gin_trgm_ops"]
+                ),
+            )
+        ),
+    ]
@@ -0,0 +1,60 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+from utils.models.operations import PostgreSQLOnly
+
+# Title matches rank above author matches, which rank above description matches
+SEARCH_VECTOR_EXPRESSION = """
+    setweight(to_tsvector('english', coalesce({row}.title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce({row}.author, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce({row}.description, '')), 'C')
+"""
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("book", "0002_book_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="book",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        PostgreSQLOnly(
+            migrations.RunSQL(
+                sql=f"""
+                    CREATE OR REPLACE FUNCTION books_search_vector_update() RETURNS trigger AS $$
+                    BEGIN
+                      NEW.search_vector := {SEARCH_VECTOR_EXPRESSION.format(row='NEW')};
+                      RETURN NEW;
+                    END
+                    $$ LANGUAGE plpgsql;
+
+                    CREATE TRIGGER books_search_vector_trigger
+                    BEFORE INSERT OR UPDATE OF title, author, description ON books
+                    FOR EACH ROW EXECUTE FUNCTION books_search_vector_update();
+
+                    UPDATE books SET search_vector = {SEARCH_VECTOR_EXPRESSION.format(row='books')};
+                """,
+                reverse_sql="""
+                    DROP TRIGGER IF EXISTS books_search_vector_trigger ON books;
+                    DROP FUNCTION IF EXISTS books_search_vector_update();
+                """,
+            )
+        ),
+        PostgreSQLOnly(
+            AddIndexConcurrently(
+                model_name="book",
+                index=django.contrib.postgres.indexes.GinIndex(
+                    fields=["search_vector"], name="books_search_vector_idx"
+                ),
+            )
+        ),
+    ]
@@ -0,0 +1,37 @@
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+from utils.models.operations import PostgreSQLOnly
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("book", "0003_book_search_vector"),
+        ("user", "0001_initial"),
+    ]
+
+    operations = [
+        PostgreSQLOnly(
+            AddIndexConcurrently(
+                model_name="book",
+                index=models.Index(
+                    condition=models.Q(("deleted_at", None)),
+                    fields=["-created_at", "-id"],
+                    name="books_live_created_idx",
+                ),
+            )
+        ),
+        PostgreSQLOnly(
+            AddIndexConcurrently(
+                model_name="book",
+                index=models.Index(
+                    condition=models.Q(("deleted_at", None)),
+                    fields=["added_by", "-created_at", "-id"],
+                    name="books_live_added_by_idx",
+                ),
+            )
+        ),
+    ]
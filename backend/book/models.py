@@ -1,5 +1,8 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from user.models import User
+import utils.models.lookups  # noqa: F401 - registers the trigram_icontains lookup
 
 class Book(models.Model):
   id = models.BigAutoField(primary_key=True, null=False)
@@ -12,9 +15,29 @@ class Book(models.Model):
   created_at = models.DateTimeField(auto_now_add=True)
   updated_at = models.DateTimeField(auto_now=True)
   deleted_at = models.DateTimeField(null=True, blank=True)
+  # Maintained by the books_search_vector_trigger database trigger (PostgreSQL only)
+  search_vector = SearchVectorField(null=True, editable=False)
 
   class Meta:
     db_table = 'books'
+    indexes = [
+      # Partial indexes cover live (not soft-deleted) rows in list order: newest first, id as tie-breaker
+      models.Index(
+        fields=['-created_at', '-id'],
+        name='books_live_created_idx',
+        condition=models.Q(deleted_at=None)
+      ),
+      models.Index(
+        fields=['added_by', '-created_at', '-id'],
+        name='books_live_added_by_idx',
+        condition=models.Q(deleted_at=None)
+      ),
+      # Trigram indexes serve substring search (title__trigram_icontains / author__trigram_icontains)
+      GinIndex(fields=['title'], name='books_title_trgm_idx', opclasses=['gin_trgm_ops']),
+      GinIndex(fields=['author'], name='books_author_trgm_idx', opclasses=['gin_trgm_ops']),
+      # Full-text index serves ranked search (search_vector=SearchQuery(...))
+      GinIndex(fields=['search_vector'], name='books_search_vector_idx'),
+    ]
 
     def __str__(self):
       return f"{self.title} ({self.author})"
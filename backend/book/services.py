@@ -1,8 +1,58 @@
+import hashlib
+import json
+import time
+import httpx
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import IntegrityError, connection, transaction
 from django.utils import timezone as django_timezone
-from django.db.models import F
+from django.db.models import Count, F, FloatField, Max, Q, Value
+from django.db.models.functions import Cast
+from book.dto.book_fields import BOOK_FIELDS
+from book.cache import MISSING, GoogleBooksResult, GoogleBooksWarmer, book_detail_cache, book_list_cache, google_books_cache
+from book.dto.create_book_dto import CreateBookDto
+from book.google_books import (
+  MAX_PAGE_SIZE,
+  async_google_books_client,
+  google_books_client,
+  trimmed_params,
+  volume_isbns,
+  volume_to_book,
+)
 from book.models import Book
-from utils.exceptions import NotFoundException, ConflictException, ExternalAPIException
+from user.services import UserService
+from utils.db import is_unique_violation, update_returning
+from utils.circuit_breaker import CircuitOpenError
+from utils.exceptions import NotFoundException, ConflictException, ExternalAPIException, ServiceUnavailableException
+from utils.pagination import KeysetPaginator
+
+# Books are listed newest first, id breaks ties between equal timestamps
+books_paginator = KeysetPaginator(['created_at', 'id'])
+# Full-text search results are listed by relevance
+ranked_books_paginator = KeysetPaginator(['rank', 'id'])
+
+# Fields returned for each book by list queries (get_books, export_books) unless narrowed with fields=
+BOOK_LIST_FIELDS = BOOK_FIELDS
+# Fields returned by get_book_by_id unless narrowed with fields=
+BOOK_DETAIL_FIELDS = tuple(name for name in BOOK_FIELDS if name != 'created_at')
+
+# Book columns read back after a write, the added_by user is looked up separately
+BOOK_COLUMNS = ('id', 'title', 'author', 'description', 'price', 'isbn', 'added_by_id')
+
+# How each added_by_* field is read, added_by_user_id comes from the books row itself
+ADDED_BY_EXPRESSIONS = {
+  'added_by_user_id': F('added_by_id'),
+  'added_by_email': F('added_by__email'),
+  'added_by_name': F('added_by__name'),
+  'added_by_role': F('added_by__role'),
+}
+
+# Text search configuration, must match the books_search_vector_trigger function
+SEARCH_CONFIG = 'english'
+
+user_service = UserService()
 
 class BookService:
   def create_book(self, dto, userId) -> dict:
@@ -19,39 +69,142 @@ class BookService:
     Raises:
         ConflictException: If ISBN already exists
     """
-    # Check if ISBN already exists (if provided)
-    if dto.get('isbn'):
-      existing_book = Book.objects.filter(isbn=dto['isbn'], deleted_at=None).first()
-      if existing_book:
+    book_data = dict(dto)
+    # Store missing ISBNs as NULL, the unique constraint allows many NULLs but only one ''
+    if 'isbn' in book_data:
+      book_data['isbn'] = book_data['isbn'] or None
+
+    # A single INSERT ... RETURNING id; ISBN conflicts surface as a unique violation,
+    # so there is no window between a pre-check and the insert
+    try:
+      book = Book.objects.create(added_by_id=userId, **book_data)
+    except IntegrityError as e:
+      if self._is_isbn_conflict(e):
         raise ConflictException('Book with this ISBN already exists')
+      raise
 
-    # Set added_by to the user ID
-    dto['added_by_id'] = userId
-
-    book = Book.objects.create(**dto)
-    book_data = Book.objects.filter(id=book.id).select_related('added_by').annotate(
-      added_by_user_id=F('added_by__id'),
-      added_by_email=F('added_by__email'),
-      added_by_name=F('added_by__name'),
-      added_by_role=F('added_by__role')
-    ).values(
-      'id',
-      'title',
-      'author',
-      'description',
-      'price',
-      'isbn',
-      'added_by_user_id',
-      'added_by_email',
-      'added_by_name',
-      'added_by_role'
-    ).first()
-    return book_data
+    # The new ID may have been cached as missing
+    self._books_changed(book.id)
+    return self._serialize_book(book, user_service.get_user_summary(userId))
+
+  def bulk_create_books(self, items, userId, batch_size=None) -> dict:
+    """
+    Create many books in one transaction.
+
+    Each item is validated against CreateBookDto. ISBN conflicts with existing
+    rows are found with a single isbn = ANY(...) query, and duplicates inside
+    the batch are found in memory. The remaining books are inserted with
+    bulk_create. Invalid or conflicting items are reported per item and do not
+    abort the rest of the batch.
+
+    Args:
+        items: List of dictionaries with book data (title, author, description, price, isbn)
+        userId: User ID who is adding the books
+        batch_size: Rows per INSERT statement (default: BOOKS_BULK_BATCH_SIZE)
+
+    Returns:
+        dict: 'created' and 'failed' counts and per-item 'results' in request order,
+              each with 'index', 'status' ('created', 'invalid' or 'conflict')
+              and either 'book' or 'error'
 
-  def get_books(self, filters=None) -> list:
+    Raises:
+        ConflictException: If a concurrent insert claimed one of the ISBNs (nothing is created)
+    """
+    results = [None] * len(items)
+    valid_items = []
+
+    for index, item in enumerate(items):
+      dto = CreateBookDto(data=item)
+      if not dto.is_valid():
+        results[index] = {'index': index, 'status': 'invalid', 'error': dto.errors}
+        continue
+      book_data = dict(dto.validated_data)
+      # Store missing ISBNs as NULL, the unique constraint allows many NULLs but only one ''
+      book_data['isbn'] = book_data.get('isbn') or None
+      valid_items.append((index, book_data))
+
+    # The unique constraint covers soft-deleted rows too, so check against every row
+    isbns = [book_data['isbn'] for _, book_data in valid_items if book_data['isbn']]
+    existing_isbns = set()
+    if isbns:
+      existing_isbns = set(Book.objects.filter(isbn__any=isbns).values_list('isbn', flat=True))
+
+    seen_isbns = set()
+    pending = []
+    for index, book_data in valid_items:
+      isbn = book_data['isbn']
+      if isbn in existing_isbns:
+        results[index] = {'index': index, 'status': 'conflict', 'error': 'Book with this ISBN already exists'}
+        continue
+      if isbn in seen_isbns:
+        results[index] = {'index': index, 'status': 'conflict', 'error': 'Duplicate ISBN within the batch'}
+        continue
+      if isbn:
+        seen_isbns.add(isbn)
+      pending.append((index, Book(added_by_id=userId, **book_data)))
+
+    if pending:
+      try:
+        with transaction.atomic():
+          Book.objects.bulk_create(
+            [book for _, book in pending],
+            batch_size=batch_size or settings.BOOKS_BULK_BATCH_SIZE
+          )
+      except IntegrityError as e:
+        if self._is_isbn_conflict(e):
+          raise ConflictException('An ISBN in the batch was created concurrently, no books were created')
+        raise
+
+      self._books_changed(*(book.id for _, book in pending))
+      added_by = user_service.get_user_summary(userId)
+      for index, book in pending:
+        results[index] = {'index': index, 'status': 'created', 'book': self._serialize_book(book, added_by)}
+
+    created_count = len(pending)
+    return {
+      'created': created_count,
+      'failed': len(items) - created_count,
+      'results': results,
+    }
+
+  def _serialize_book(self, book, added_by) -> dict:
+    """
+    Serialize a book in the same shape as get_book_by_id,
+    using already-known user data instead of a join.
+
+    Args:
+        book: Book model instance or dictionary with the book columns
+        added_by: Dictionary with the adding user's id, email, name and role (or None)
+
+    Returns:
+        dict: Serialized book data with user data
+    """
+    if not isinstance(book, dict):
+      book = {name: getattr(book, name) for name in BOOK_COLUMNS}
+    added_by = added_by or {}
+
+    return {
+      'id': book['id'],
+      'title': book['title'],
+      'author': book['author'],
+      'description': book['description'],
+      'price': book['price'],
+      'isbn': book['isbn'],
+      'added_by_user_id': book['added_by_id'],
+      'added_by_email': added_by.get('email'),
+      'added_by_name': added_by.get('name'),
+      'added_by_role': added_by.get('role'),
+    }
+
+  def _is_isbn_conflict(self, error) -> bool:
+    return is_unique_violation(error, Book, 'isbn')
+
+  def get_books(self, filters=None, version=None) -> dict:
     """
-    Get all books with optional filters.
+    Get a page of books with optional filters.
     Includes user data via left join.
+    Uses keyset pagination on (created_at, id), newest first.
+    Pages are cached per filter set until the next book write (see BookListCache).
 
     Args:
         filters: Dictionary with optional filters:
@@ -59,56 +212,202 @@ class BookService:
             - isbn: Filter by exact ISBN
             - author: Filter by author (case-insensitive partial match)
             - added_by_user: Filter by user ID who added the book
+            - q: Full-text search over title, author and description, ordered by rank
+            - limit: Maximum number of books per page (default: 20)
+            - cursor: Opaque cursor returned by a previous page
+            - fields: List of fields to return (default: BOOK_LIST_FIELDS)
+        version: ETag from get_books_validators for the same filters, if computed.
+                 Cached pages are only reused for that version, so the page
+                 served always matches the ETag sent with it.
 
     Returns:
-        list: List of serialized book data with nested user data
-    """
-    queryset = Book.objects.filter(deleted_at=None).select_related('added_by').annotate(
-      added_by_user_id=F('added_by__id'),
-      added_by_email=F('added_by__email'),
-      added_by_name=F('added_by__name'),
-      added_by_role=F('added_by__role')
-    ).values(
-      'id',
-      'title',
-      'author',
-      'description',
-      'price',
-      'isbn',
-      'created_at',
-      'added_by_user_id',
-      'added_by_email',
-      'added_by_name',
-      'added_by_role'
+        dict: Page with 'results' (serialized book data with nested user data)
+              and 'next'/'prev' cursors (None when there is no such page).
+              With 'q', results are ordered by relevance and include 'rank'.
+
+    Raises:
+        BadRequestException: If the cursor is malformed
+    """
+    filters = filters or {}
+    return book_list_cache.get_or_load(filters, lambda: self._load_books_page(filters), version=version)
+
+  def _load_books_page(self, filters) -> dict:
+    paginator = ranked_books_paginator if filters.get('q') else books_paginator
+
+    page = paginator.paginate(
+      self.get_books_queryset(filters),
+      cursor=filters.get('cursor'),
+      limit=filters.get('limit', 20)
     )
 
-    if filters:
-      # Filter by title (case-insensitive partial match)
-      if filters.get('title'):
-        queryset = queryset.filter(title__icontains=filters['title'])
+    # Pagination keys are always selected to build cursors, drop the ones not requested
+    if filters.get('fields'):
+      unrequested = [key for key in ('created_at', 'id') if key not in filters['fields']]
+      for row in page['results']:
+        for key in unrequested:
+          del row[key]
 
-      # Filter by ISBN (exact match)
-      if filters.get('isbn'):
-        queryset = queryset.filter(isbn=filters['isbn'])
+    return page
+
+  def get_books_validators(self, filters) -> tuple:
+    """
+    Cache validators for a get_books page, from one aggregate over the
+    filtered live rows instead of the page query: MAX(updated_at) catches
+    inserts and updates, COUNT catches (soft) deletions.
 
-      # Filter by author (case-insensitive partial match)
-      if filters.get('author'):
-        queryset = queryset.filter(author__icontains=filters['author'])
+    Only an ETag is returned. A Last-Modified from MAX(updated_at) would
+    not move on a soft delete, which sets deleted_at alone, so clients
+    revalidating with If-Modified-Since would keep deleted books.
+    Pass the ETag to get_books as version, so the page served matches it.
 
-      # Filter by added_by_user (user ID)
-      if filters.get('added_by_user'):
-        queryset = queryset.filter(added_by_id=filters['added_by_user'])
+    The weak ETag also covers the query (filters, fields, cursor, limit).
+    Changes to the adding user's name, email or role are not reflected.
 
-    books = queryset.order_by('-created_at')
-    return list(books)
+    Args:
+        filters: Dictionary with the same filters as get_books
 
-  def get_book_by_id(self, book_id) -> dict:
+    Returns:
+        tuple: (weak ETag, None)
+    """
+    queryset = self._apply_filters(Book.objects.filter(deleted_at=None), filters)
+    if filters.get('q'):
+      queryset = self._search_books(queryset, filters['q'])
+
+    stats = queryset.aggregate(last_modified=Max('updated_at'), count=Count('id'))
+    query = {name: value for name, value in filters.items() if value not in (None, '', [])}
+    return self._weak_etag([query, stats['count'], stats['last_modified']]), None
+
+  def _weak_etag(self, parts) -> str:
+    raw = json.dumps(parts, sort_keys=True, default=str)
+    digest = hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+  def get_books_queryset(self, filters):
+    """
+    Build the filtered, unpaginated books queryset used by get_books.
+
+    Args:
+        filters: Dictionary with the same filters as get_books
+
+    Returns:
+        QuerySet: values() queryset of live books, joined with users only
+                  when an added_by_* field is selected
+    """
+    fields = filters.get('fields') or BOOK_LIST_FIELDS
+    # Pagination keys are needed for cursors even when not requested
+    fields = [*fields, *(key for key in ('created_at', 'id') if key not in fields)]
+    queryset = self._select_fields(Book.objects.filter(deleted_at=None), fields)
+
+    queryset = self._apply_filters(queryset, filters)
+
+    # Full-text search (ranked)
+    if filters.get('q'):
+      queryset = self._search_books(queryset, filters['q'])
+
+    return queryset
+
+  def export_books(self, filters=None):
+    """
+    Iterate over every book matching the filters, newest first.
+    Rows are read through a server-side cursor in chunks of
+    BOOKS_EXPORT_CHUNK_SIZE, so memory stays flat regardless of catalog size.
+
+    Args:
+        filters: Dictionary with optional filters (title, isbn, author, added_by_user)
+
+    Returns:
+        Iterator[dict]: Book rows with the BOOK_LIST_FIELDS keys
+    """
+    queryset = self.get_books_queryset(filters or {}).order_by('-created_at', '-id')
+    return queryset.iterator(chunk_size=settings.BOOKS_EXPORT_CHUNK_SIZE)
+
+  def _select_fields(self, queryset, fields):
+    """
+    Narrow a books queryset to a values() projection of the given fields.
+    The users join is only added when an added_by_* field other than
+    added_by_user_id is requested.
+
+    Args:
+        queryset: Books queryset
+        fields: Field names from BOOK_FIELDS
+
+    Returns:
+        QuerySet: values() queryset with exactly these fields
+    """
+    annotations = {name: ADDED_BY_EXPRESSIONS[name] for name in fields if name in ADDED_BY_EXPRESSIONS}
+    if annotations:
+      queryset = queryset.annotate(**annotations)
+    return queryset.values(*fields)
+
+  def _apply_filters(self, queryset, filters):
+    """
+    Apply the title, isbn, author and added_by_user filters to a books queryset
+
+    Args:
+        queryset: Books queryset
+        filters: Dictionary with optional filters (see get_books)
+
+    Returns:
+        QuerySet: Filtered queryset
+    """
+    # Filter by title (case-insensitive partial match)
+    if filters.get('title'):
+      queryset = queryset.filter(title__trigram_icontains=filters['title'])
+
+    # Filter by ISBN (exact match)
+    if filters.get('isbn'):
+      queryset = queryset.filter(isbn=filters['isbn'])
+
+    # Filter by author (case-insensitive partial match)
+    if filters.get('author'):
+      queryset = queryset.filter(author__trigram_icontains=filters['author'])
+
+    # Filter by added_by_user (user ID)
+    if filters.get('added_by_user'):
+      queryset = queryset.filter(added_by_id=filters['added_by_user'])
+
+    return queryset
+
+  def _search_books(self, queryset, q):
+    """
+    Apply ranked full-text search to a books queryset.
+
+    On PostgreSQL this matches against the GIN-indexed search_vector column
+    (title weighted above author, above description) and annotates ts_rank.
+    Other backends fall back to substring matching with a constant rank.
+
+    Args:
+        queryset: Books values() queryset
+        q: Search query in websearch syntax (e.g. 'tolkien -hobbit "middle earth"')
+
+    Returns:
+        QuerySet: Filtered queryset annotated with 'rank'
+    """
+    if connection.vendor == 'postgresql':
+      query = SearchQuery(q, search_type='websearch', config=SEARCH_CONFIG)
+      # ts_rank returns real (float4), cast to double precision so the value stored in a
+      # keyset cursor round-trips exactly and the seek predicate (rank = / < cursor)
+      # compares like with like; otherwise rows tied on rank are skipped or repeated
+      return queryset.filter(search_vector=query).annotate(
+        rank=Cast(SearchRank(F('search_vector'), query), FloatField())
+      )
+
+    return queryset.filter(
+      Q(title__trigram_icontains=q) |
+      Q(author__trigram_icontains=q) |
+      Q(description__trigram_icontains=q)
+    ).annotate(rank=Value(0.0, output_field=FloatField()))
+
+  def get_book_by_id(self, book_id, fields=None) -> dict:
     """
     Get a book by ID.
     Includes user data via left join.
+    Read through book_detail_cache: the full row is cached once and projected
+    to the requested fields, missing IDs are cached as well.
 
     Args:
         book_id: Book ID
+        fields: List of fields to return (default: BOOK_DETAIL_FIELDS)
 
     Returns:
         dict: Serialized book data with nested user data
@@ -116,25 +415,63 @@ class BookService:
     Raises:
         NotFoundException: If book not found or deleted
     """
-    book_data = Book.objects.filter(id=book_id, deleted_at=None).select_related('added_by').annotate(
-      added_by_user_id=F('added_by__id'),
-      added_by_email=F('added_by__email'),
-      added_by_name=F('added_by__name'),
-      added_by_role=F('added_by__role')
-    ).values(
-      'id',
-      'title',
-      'author',
-      'description',
-      'price',
-      'isbn',
-      'added_by_user_id',
-      'added_by_email',
-      'added_by_name',
-      'added_by_role'
-    ).first()
-
-    if not book_data:
+    book_data = self._get_book_row(book_id)
+    return {name: book_data[name] for name in fields or BOOK_DETAIL_FIELDS}
+
+  def get_book_validators(self, book_id, fields=None) -> tuple:
+    """
+    Cache validators for get_book_by_id, from the row's updated_at.
+
+    With a shared books cache, reads through book_detail_cache, so the detail
+    lookup that follows is a cache hit. Otherwise other workers' writes never
+    reach the cached row, so updated_at is read from the database by primary
+    key, and a cached row that no longer matches it is dropped so the response
+    body matches the ETag.
+
+    Args:
+        book_id: Book ID
+        fields: Requested fields (part of the representation, so of the ETag)
+
+    Returns:
+        tuple: (weak ETag, last modified datetime), or None when unknown
+
+    Raises:
+        NotFoundException: If book not found or deleted
+    """
+    if book_detail_cache.enabled and book_detail_cache.is_shared:
+      updated_at = self._get_book_row(book_id).get('updated_at')
+    else:
+      updated_at = Book.objects.filter(id=book_id, deleted_at=None).values_list('updated_at', flat=True).first()
+      if updated_at is None:
+        raise NotFoundException('Book not found')
+      book_detail_cache.discard_stale(book_id, updated_at)
+
+    if updated_at is None:
+      return None
+    return self._weak_etag([book_id, fields, updated_at]), updated_at
+
+  def _get_book_row(self, book_id) -> dict:
+    """
+    Read the full book row (BOOK_FIELDS and updated_at) through book_detail_cache.
+
+    Raises:
+        NotFoundException: If book not found or deleted
+    """
+    book_data = book_detail_cache.get(book_id)
+
+    if book_data is None:
+      book_data = self._select_fields(
+        Book.objects.filter(id=book_id, deleted_at=None),
+        [*BOOK_FIELDS, 'updated_at']
+      ).first()
+
+      if not book_data:
+        book_detail_cache.set_missing(book_id)
+        raise NotFoundException('Book not found')
+
+      book_detail_cache.set(book_id, book_data)
+
+    if book_data == MISSING:
       raise NotFoundException('Book not found')
 
     return book_data
@@ -154,46 +491,27 @@ class BookService:
         NotFoundException: If book not found or deleted
         ConflictException: If ISBN already exists (when updating ISBN)
     """
+    values = dict(dto)
+    if 'isbn' in values:
+      values['isbn'] = values['isbn'] or None
+    # update() skips auto_now, so set updated_at explicitly
+    values['updated_at'] = django_timezone.now()
+
+    # A single UPDATE ... RETURNING that only writes the changed columns;
+    # ISBN conflicts surface as a unique violation instead of a racy pre-check
     try:
-      book = Book.objects.get(id=book_id, deleted_at=None)
-    except Book.DoesNotExist:
-      raise NotFoundException('Book not found')
-
-    # Check if ISBN is being updated and if it conflicts with existing book
-    if 'isbn' in dto and dto['isbn'] and dto['isbn'] != book.isbn:
-      existing_book = Book.objects.filter(isbn=dto['isbn'], deleted_at=None).exclude(id=book_id).first()
-      if existing_book:
+      rows = update_returning(Book.objects.filter(id=book_id, deleted_at=None), values, BOOK_COLUMNS)
+    except IntegrityError as e:
+      if self._is_isbn_conflict(e):
         raise ConflictException('Book with this ISBN already exists')
+      raise
 
-    # Update book fields
-    for key, value in dto.items():
-      setattr(book, key, value)
-
-    book.save()
-
-    # Get updated book with user data using annotate and values()
-    book_data = Book.objects.filter(id=book_id).select_related('added_by').annotate(
-      added_by_user_id=F('added_by__id'),
-      added_by_email=F('added_by__email'),
-      added_by_name=F('added_by__name'),
-      added_by_role=F('added_by__role')
-    ).values(
-      'id',
-      'title',
-      'author',
-      'description',
-      'price',
-      'isbn',
-      'added_by_user_id',
-      'added_by_email',
-      'added_by_name',
-      'added_by_role'
-    ).first()
-
-    if not book_data:
+    if not rows:
       raise NotFoundException('Book not found')
 
-    return book_data
+    self._books_changed(book_id)
+    book = rows[0]
+    return self._serialize_book(book, user_service.get_user_summary(book['added_by_id']))
 
   def delete_book(self, book_id) -> None:
     """
@@ -213,9 +531,95 @@ class BookService:
     if updated_count == 0:
       raise NotFoundException('Book not found or already deleted')
 
-  def get_google_books(self, filters) -> dict:
+    self._books_changed(book_id)
+
+  def batch_update_books(self, patch, ids=None, filters=None) -> dict:
+    """
+    Apply one patch to many books with a single UPDATE statement
+
+    Args:
+        patch: Dictionary with fields to update (same fields as update_book)
+        ids: List of book IDs to update (use either ids or filters)
+        filters: Dictionary with title, isbn, author, added_by_user filters
+
+    Returns:
+        dict: 'matched' (books targeted, only known for ids) and 'updated' counts
+
+    Raises:
+        ConflictException: If the patch sets an ISBN that another book already has,
+                           or would give the same ISBN to more than one book
+    """
+    queryset = self._batch_queryset(ids, filters)
+    patch = dict(patch)
+
+    if 'isbn' in patch:
+      # Blank ISBNs are stored as NULL so several books can be without one
+      patch['isbn'] = patch['isbn'] or None
+
+    if patch.get('isbn'):
+      # One query is enough to know whether the ISBN fits: at most one target, no other holder
+      target_ids = list(queryset.values_list('id', flat=True)[:2])
+      if len(target_ids) > 1:
+        raise ConflictException(
+          'Cannot set the same ISBN on more than one book',
+          error={'isbn': patch['isbn']}
+        )
+      if Book.objects.filter(isbn=patch['isbn']).exclude(id__any=target_ids).exists():
+        raise ConflictException(
+          'Book with this ISBN already exists',
+          error={'isbn': patch['isbn']}
+        )
+
+    # RETURNING id tells which cached rows to invalidate without another query
+    try:
+      rows = update_returning(queryset, {**patch, 'updated_at': django_timezone.now()}, ['id'])
+    except IntegrityError as e:
+      if self._is_isbn_conflict(e):
+        raise ConflictException('Book with this ISBN already exists', error={'isbn': patch.get('isbn')})
+      raise
+
+    self._books_changed(*(row['id'] for row in rows))
+
+    return {
+      'matched': len(set(ids)) if ids else None,
+      'updated': len(rows),
+    }
+
+  def batch_delete_books(self, ids) -> dict:
+    """
+    Soft delete many books with a single UPDATE statement
+
+    Args:
+        ids: List of book IDs
+
+    Returns:
+        dict: 'matched' (distinct IDs requested) and 'deleted' counts;
+              IDs that were missing or already deleted are not counted as deleted
+    """
+    rows = update_returning(self._batch_queryset(ids), {'deleted_at': django_timezone.now()}, ['id'])
+    self._books_changed(*(row['id'] for row in rows))
+
+    return {
+      'matched': len(set(ids)),
+      'deleted': len(rows),
+    }
+
+  def _books_changed(self, *book_ids):
+    """Invalidate cached data after books were written: their detail rows and every cached list"""
+    book_detail_cache.invalidate(*book_ids)
+    if book_ids:
+      book_list_cache.invalidate()
+
+  def _batch_queryset(self, ids=None, filters=None):
+    queryset = Book.objects.filter(deleted_at=None)
+    if ids:
+      return queryset.filter(id__any=ids)
+    return self._apply_filters(queryset, filters or {})
+
+  def get_google_books(self, filters) -> GoogleBooksResult:
     """
     Fetch books from Google Books API
+    Responses are cached per query (see GoogleBooksCache), popular queries are kept warm (see GoogleBooksWarmer).
 
     Args:
         filters: Dictionary with Google Books API query parameters:
@@ -227,21 +631,212 @@ class BookService:
             - orderBy: Sort order (optional)
             - langRestrict: Language restriction (optional)
             - projection: Information level (optional)
+            - mode: 'full' (default), 'trimmed' or 'passthrough' (not sent upstream)
 
     Returns:
-        dict: Response from Google Books API
+        GoogleBooksResult: Response from Google Books API (data: dict, or the
+                           undecoded JSON bytes in passthrough mode) and its cache status
+
+    Raises:
+        ExternalAPIException: If the request fails and no stale response is cached
+        ServiceUnavailableException: If Google Books keeps failing (circuit open) and no stale response is cached
     """
-    google_books_api_url = 'https://www.googleapis.com/books/v1/volumes'
+    google_books_warmer.record(filters)
+    cache_params, fetch = self._google_books_request(filters)
+    return google_books_cache.get_or_fetch(cache_params, fetch)
 
-    # Prepare query parameters, excluding None values
-    params = {k: v for k, v in filters.items() if v is not None}
+  def _google_books_request(self, filters):
+    """
+    Returns:
+        tuple: (cache key parameters, zero-argument callable fetching the response upstream)
+    """
+    params, raw = self._google_books_params(filters)
+    # The mode is part of the cache key: passthrough entries hold bytes, the others dicts
+    cache_params = dict(params, mode=filters.get('mode') or 'full')
+    return cache_params, lambda: self._fetch_google_books(params, raw)
 
+  def _google_books_params(self, filters):
+    """
+    Returns:
+        tuple: (upstream query parameters, whether the body is relayed undecoded)
+    """
+    # Prepare query parameters, excluding None values and our own options
+    params = {k: v for k, v in filters.items() if v is not None and k != 'mode'}
+    mode = filters.get('mode') or 'full'
+    if mode == 'trimmed':
+      params = trimmed_params(params)
+    return params, mode == 'passthrough'
+
+  def _fetch_google_books(self, params, raw=False):
     try:
-      response = requests.get(google_books_api_url, params=params, timeout=10)
-      response.raise_for_status()  # Raise an exception for bad status codes
-      return response.json()
+      if raw:
+        return google_books_client.search_volumes_raw(params)
+      return google_books_client.search_volumes(params)
+    except CircuitOpenError as e:
+      raise ServiceUnavailableException(
+        'Google Books API is temporarily unavailable',
+        retry_after=e.retry_after
+      )
     except requests.exceptions.RequestException as e:
       raise ExternalAPIException(
         'Failed to fetch books from Google Books API',
         e
       )
+
+  async def aget_google_books(self, filters) -> GoogleBooksResult:
+    """
+    Async variant of get_google_books for async views, sharing its response cache.
+
+    Args:
+        filters: Dictionary with Google Books API query parameters (see get_google_books)
+
+    Returns:
+        GoogleBooksResult: Response from Google Books API (data) and its cache status
+
+    Raises:
+        ExternalAPIException: If the request fails and no stale response is cached
+        ServiceUnavailableException: If Google Books keeps failing (circuit open) and no stale response is cached
+    """
+    google_books_warmer.record(filters)
+    params, raw = self._google_books_params(filters)
+
+    return await google_books_cache.aget_or_fetch(
+      dict(params, mode=filters.get('mode') or 'full'),
+      lambda: self._afetch_google_books(params, raw)
+    )
+
+  async def _afetch_google_books(self, params, raw=False):
+    try:
+      if raw:
+        return await async_google_books_client.search_volumes_raw(params)
+      return await async_google_books_client.search_volumes(params)
+    except CircuitOpenError as e:
+      raise ServiceUnavailableException(
+        'Google Books API is temporarily unavailable',
+        retry_after=e.retry_after
+      )
+    except httpx.HTTPError as e:
+      raise ExternalAPIException(
+        'Failed to fetch books from Google Books API',
+        error=self._httpx_error_info(e)
+      )
+
+  def _httpx_error_info(self, error) -> dict:
+    # Same request/response structure ExternalAPIException builds for requests errors
+    response = getattr(error, 'response', None) if isinstance(error, httpx.HTTPStatusError) else None
+    try:
+      request = error.request
+    except RuntimeError:
+      request = None
+    return {
+      'request': {
+        'url': str(request.url) if request is not None else None,
+        'method': request.method if request is not None else None,
+      },
+      'response': {
+        'status_code': response.status_code if response is not None else None,
+        'reason': response.reason_phrase if response is not None else None,
+        'data': response.text[:1000] if response is not None else None,
+        'message': str(error),
+      },
+    }
+
+  def import_google_books(self, q, userId, max_items=None, workers=None, params=None) -> dict:
+    """
+    Import Google Books search results into the books table.
+
+    The first page gives totalItems, the remaining startIndex windows of
+    MAX_PAGE_SIZE volumes are fetched in parallel by a bounded thread pool.
+    Volumes are deduplicated by ISBN-13/ISBN-10 (both forms of every volume)
+    against existing rows in one isbn = ANY(...) query and within the import,
+    then inserted with bulk_create_books.
+
+    Args:
+        q: Google Books search query
+        userId: User ID recorded as adding the books
+        max_items: Maximum number of volumes to fetch (default: GOOGLE_BOOKS_IMPORT_MAX_ITEMS)
+        workers: Concurrent page fetches (default: GOOGLE_BOOKS_IMPORT_WORKERS)
+        params: Extra volumes query parameters (e.g. langRestrict, printType)
+
+    Returns:
+        dict: Page and volume counts, 'created', per-reason 'skipped' counts,
+              'elapsed_seconds' and 'volumes_per_second'
+    """
+    started = time.monotonic()
+    max_items = max_items or settings.GOOGLE_BOOKS_IMPORT_MAX_ITEMS
+    workers = workers or settings.GOOGLE_BOOKS_IMPORT_WORKERS
+    base_params = {k: v for k, v in (params or {}).items() if v is not None}
+    base_params['q'] = q
+
+    def fetch_page(start_index):
+      page_params = dict(base_params, startIndex=start_index, maxResults=min(MAX_PAGE_SIZE, max_items - start_index))
+      try:
+        return google_books_client.search_volumes(page_params)
+      except (requests.exceptions.RequestException, CircuitOpenError):
+        return None
+
+    first_page = fetch_page(0)
+    if first_page is None:
+      raise ExternalAPIException('Failed to fetch books from Google Books API')
+
+    total = min(max_items, first_page.get('totalItems', 0))
+    pages = [first_page]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+      pages += pool.map(fetch_page, range(MAX_PAGE_SIZE, total, MAX_PAGE_SIZE))
+
+    # Pages can overlap as results shift, keep each volume once
+    volumes = {}
+    for page in pages:
+      for volume in (page or {}).get('items', []):
+        volumes.setdefault(volume.get('id'), volume)
+
+    skipped = {'no_isbn': 0, 'existing': 0, 'duplicate': 0, 'invalid': 0}
+    candidates = []
+    for volume in volumes.values():
+      isbn, forms = volume_isbns(volume)
+      if isbn is None:
+        skipped['no_isbn'] += 1
+        continue
+      candidates.append((volume, isbn, forms))
+
+    # The unique constraint covers soft-deleted rows too, so check against every row
+    all_forms = [form for _, _, forms in candidates for form in forms]
+    existing = set()
+    if all_forms:
+      existing = set(Book.objects.filter(isbn__any=all_forms).values_list('isbn', flat=True))
+
+    seen = set()
+    items = []
+    for volume, isbn, forms in candidates:
+      if forms & existing:
+        skipped['existing'] += 1
+        continue
+      if forms & seen:
+        skipped['duplicate'] += 1
+        continue
+      seen |= forms
+      items.append(volume_to_book(volume, isbn))
+
+    created = 0
+    if items:
+      result = self.bulk_create_books(items, userId)
+      created = result['created']
+      skipped['invalid'] = result['failed']
+
+    elapsed = time.monotonic() - started
+    return {
+      'query': q,
+      'pages_fetched': sum(1 for page in pages if page is not None),
+      'pages_failed': sum(1 for page in pages if page is None),
+      'volumes_fetched': len(volumes),
+      'created': created,
+      'skipped': skipped,
+      'elapsed_seconds': round(elapsed, 3),
+      'volumes_per_second': round(len(volumes) / elapsed, 1) if elapsed else None,
+    }
+
+# Refreshes popular Google Books queries in the background (started on the first query)
+google_books_warmer = GoogleBooksWarmer(
+  google_books_cache,
+  lambda filters: BookService()._google_books_request(filters)
+)
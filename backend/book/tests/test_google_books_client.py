@@ -0,0 +1,112 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from django.test import SimpleTestCase, override_settings
+from book.google_books import GoogleBooksClient
+from book.management.stub_server import StubGoogleBooksHandler, start_stub_server
+from utils.circuit_breaker import CircuitBreaker
+
+POOL_SIZE = 4
+DEADLINE = 1
+
+
+class ScriptedHandler(StubGoogleBooksHandler):
+  """Serves the scripted (status, delay, headers) responses in order, then 200s, recording each connection"""
+  latency = 0
+  script = []
+  peers = set()
+  requests = 0
+  lock = threading.Lock()
+
+  @classmethod
+  def reset(cls, script=()):
+    with cls.lock:
+      cls.script = list(script)
+      cls.peers = set()
+      cls.requests = 0
+
+  def do_GET(self):
+    with self.lock:
+      ScriptedHandler.requests += 1
+      ScriptedHandler.peers.add(self.client_address)
+      status, delay, headers = self.script.pop(0) if self.script else (200, 0, {})
+    time.sleep(delay)
+    body = self.body if status == 200 else b'{"error": {"message": "scripted"}}'
+    self.send_response(status)
+    self.send_header('Content-Type', 'application/json')
+    self.send_header('Content-Length', str(len(body)))
+    for name, value in headers.items():
+      self.send_header(name, value)
+    self.end_headers()
+    self.wfile.write(body)
+
+
+# Small delays keep the whole case to a few seconds
+@override_settings(
+  GOOGLE_BOOKS_POOL_SIZE=POOL_SIZE,
+  GOOGLE_BOOKS_MAX_RETRIES=2,
+  GOOGLE_BOOKS_RETRY_BACKOFF=0.01,
+  GOOGLE_BOOKS_CONNECT_TIMEOUT=1,
+  GOOGLE_BOOKS_READ_TIMEOUT=5,
+  GOOGLE_BOOKS_DEADLINE=DEADLINE,
+)
+class GoogleBooksClientTests(SimpleTestCase):
+  """GoogleBooksClient against a local stub server: connection reuse, retries and the deadline"""
+
+  @classmethod
+  def setUpClass(cls):
+    super().setUpClass()
+    cls.server, cls.url = start_stub_server(ScriptedHandler)
+    cls.addClassCleanup(cls.server.shutdown)
+
+  def setUp(self):
+    ScriptedHandler.reset()
+    self.client = GoogleBooksClient(base_url=self.url)
+    # A private breaker, so failures provoked here never open the shared one
+    self.client.breaker = CircuitBreaker('google_books_test', failure_threshold=1000)
+    self.addCleanup(self.client.close)
+
+  def test_sequential_calls_reuse_one_connection(self):
+    for index in range(20):
+      self.client.search_volumes({'q': f'reuse {index}'})
+    self.assertEqual(len(ScriptedHandler.peers), 1)
+
+  def test_concurrent_calls_stay_within_the_pool(self):
+    ScriptedHandler.latency = 0.02
+    self.addCleanup(setattr, ScriptedHandler, 'latency', 0)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+      list(pool.map(lambda index: self.client.search_volumes({'q': f'pool {index}'}), range(40)))
+    self.assertLessEqual(len(ScriptedHandler.peers), POOL_SIZE)
+
+  def test_transient_errors_are_retried(self):
+    ScriptedHandler.reset([(503, 0, {}), (502, 0, {})])
+    self.client.search_volumes({'q': 'retry'})
+    self.assertEqual(ScriptedHandler.requests, 3)
+
+  def test_retries_stop_after_max_retries(self):
+    ScriptedHandler.reset([(503, 0, {})] * 5)
+    with self.assertRaises(requests.exceptions.HTTPError):
+      self.client.search_volumes({'q': 'retry limit'})
+    self.assertEqual(ScriptedHandler.requests, 3)
+
+  def test_client_errors_are_not_retried(self):
+    ScriptedHandler.reset([(400, 0, {})])
+    with self.assertRaises(requests.exceptions.HTTPError):
+      self.client.search_volumes({'q': 'bad'})
+    self.assertEqual(ScriptedHandler.requests, 1)
+
+  def test_deadline_cuts_a_slow_response_short(self):
+    ScriptedHandler.reset([(200, 3, {})])
+    started = time.monotonic()
+    with self.assertRaises(requests.exceptions.Timeout):
+      self.client.search_volumes({'q': 'slow'})
+    self.assertLess(time.monotonic() - started, DEADLINE + 0.5)
+
+  def test_no_retry_when_its_backoff_passes_the_deadline(self):
+    ScriptedHandler.reset([(503, 0, {'Retry-After': '5'})])
+    started = time.monotonic()
+    with self.assertRaises(requests.exceptions.HTTPError):
+      self.client.search_volumes({'q': 'retry after'})
+    self.assertEqual(ScriptedHandler.requests, 1)
+    self.assertLess(time.monotonic() - started, 0.5)
@@ -0,0 +1,47 @@
+import io
+import json
+from unittest import skipUnless
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from book.management.commands.check_query_plans import Command
+from book.services import BookService, books_paginator
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Query plan checks require PostgreSQL')
+class QueryPlanTests(TestCase):
+  """The check_query_plans assertions, run by the test suite against the test database"""
+
+  def setUp(self):
+    self.command = Command(stdout=io.StringIO())
+    self.book_service = BookService()
+    with connection.cursor() as cursor:
+      # Lasts until the test's transaction is rolled back, see check_query_plans
+      cursor.execute('SET LOCAL enable_seqscan = off')
+
+  def test_queries_use_their_indexes(self):
+    for name, queryset, expected_indexes, seek_column in self.command.plan_checks(self.book_service):
+      with self.subTest(name):
+        self.assertIsNone(self.command.plan_error(queryset, expected_indexes, seek_column))
+
+  def test_cursor_page_seeks_into_the_index(self):
+    # The query the list endpoint actually runs for a page after a cursor
+    cursor = books_paginator.encode_cursor({'created_at': timezone.now(), 'id': 1}, 'next')
+    with CaptureQueriesContext(connection) as queries:
+      self.book_service._load_books_page({'limit': 20, 'cursor': cursor})
+    sql = next(query['sql'] for query in queries if 'ORDER BY' in query['sql'])
+
+    with connection.cursor() as db_cursor:
+      db_cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}')
+      plan = db_cursor.fetchone()[0]
+    plan = (json.loads(plan) if isinstance(plan, str) else plan)[0]['Plan']
+
+    self.assertIn('books_live_created_idx', self.command._collect_indexes(plan))
+    self.assertTrue(
+      any('created_at' in cond for cond in self.command._collect_index_conds(plan)),
+      'the cursor page filters the index instead of seeking into it'
+    )
+
+  def test_ranked_pagination_returns_every_row_once(self):
+    self.assertTrue(self.command.check_ranked_pagination(self.book_service), self.command.stdout.getvalue())
@@ -1,5 +1,15 @@
 from django.urls import path
-from book.views import books, book_detail, google_books
+from book.views import (
+    books,
+    book_detail,
+    books_batch,
+    books_batch_delete,
+    books_bulk,
+    books_export,
+    google_books,
+    google_books_async,
+    google_books_import,
+)
 
 app_name = 'book'
 
@@ -7,4 +17,10 @@ urlpatterns = [
     path('', books, name='books'),  # GET /api/v1/books, POST /api/v1/books
     path('/<int:book_id>', book_detail, name='book_detail'),  # GET, PATCH, DELETE /api/v1/books/<id>
     path('/google', google_books, name='google_books'),  # GET /api/v1/books/google
+    path('/google/async', google_books_async, name='google_books_async'),  # GET /api/v1/books/google/async (ASGI)
+    path('/google/import', google_books_import, name='google_books_import'),  # POST /api/v1/books/google/import
+    path('/export', books_export, name='books_export'),  # GET /api/v1/books/export
+    path('/bulk', books_bulk, name='books_bulk'),  # POST /api/v1/books/bulk
+    path('/batch', books_batch, name='books_batch'),  # PATCH /api/v1/books/batch
+    path('/batch/delete', books_batch_delete, name='books_batch_delete'),  # POST /api/v1/books/batch/delete
 ]
@@ -1,31 +1,83 @@
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from drf_yasg.utils import swagger_auto_schema
 from book.dto.create_book_dto import CreateBookDto
 from book.dto.update_book_dto import UpdateBookDto
 from book.dto.get_books_dto import GetBooksDto
+from book.dto.get_book_dto import GetBookDto
 from book.dto.google_books_dto import GoogleBooksDto
-from book.services import BookService
+from book.dto.export_books_dto import ExportBooksDto
+from book.dto.bulk_create_books_dto import BulkCreateBooksDto
+from book.dto.batch_books_dto import BatchUpdateBooksDto, BatchDeleteBooksDto
+from book.dto.import_google_books_dto import ImportGoogleBooksDto
+from book.export import EXPORT_CONTENT_TYPES, render_csv, render_ndjson
+from book.services import BookService, BOOK_LIST_FIELDS
 from utils.dto_validator import DTOValidator
+from decorators.async_api_view import async_api_view
+from decorators.conditional import conditional
 from decorators.roles import roles
 from user.models import UserRole
 
 book_service = BookService()
 
+GOOGLE_BOOKS_CONTENT_TYPE = 'application/json; charset=UTF-8'
+
+def book_list_validators(request):
+  filters = DTOValidator.validate(GetBooksDto, request.query_params)
+  etag, last_modified = book_service.get_books_validators(filters)
+  # get_books serves the page cached for this exact ETag
+  request.books_version = etag
+  return etag, last_modified
+
+def book_detail_validators(request, book_id):
+  params = DTOValidator.validate(GetBookDto, request.query_params)
+  return book_service.get_book_validators(book_id, fields=params.get('fields'))
+
+# 304 Not Modified for a matching If-None-Match, before the page query runs
+@conditional(book_list_validators)
 def get_books(request):
   filters = DTOValidator.validate(GetBooksDto, request.query_params)
-  result = book_service.get_books(filters)
+  result = book_service.get_books(filters, version=getattr(request, 'books_version', None))
   return Response(result, status=status.HTTP_200_OK)
 
+def export_books(request):
+  filters = DTOValidator.validate(ExportBooksDto, request.query_params)
+  output = filters.pop('output')
+  rows = book_service.export_books(filters)
+
+  if output == 'csv':
+    content = render_csv(rows, BOOK_LIST_FIELDS)
+  else:
+    content = render_ndjson(rows)
+
+  response = StreamingHttpResponse(content, content_type=EXPORT_CONTENT_TYPES[output])
+  response['Content-Disposition'] = f'attachment; filename="books.{output}"'
+  return response
+
 @roles([UserRole.ADMIN])
 def create_book(request):
   validated_data = DTOValidator.validate(CreateBookDto, request.data)
   result = book_service.create_book(validated_data, str(request.user.user_id))
   return Response(result, status=status.HTTP_201_CREATED)
 
+@roles([UserRole.ADMIN])
+def bulk_create_books(request):
+  validated_data = DTOValidator.validate(BulkCreateBooksDto, request.data)
+  result = book_service.bulk_create_books(
+    validated_data['books'],
+    str(request.user.user_id),
+    batch_size=validated_data.get('batch_size')
+  )
+  # 207 Multi-Status when some items were rejected
+  response_status = status.HTTP_201_CREATED if result['failed'] == 0 else status.HTTP_207_MULTI_STATUS
+  return Response(result, status=response_status)
+
+@conditional(book_detail_validators)
 def get_book_by_id(request, book_id):
-  result = book_service.get_book_by_id(book_id)
+  params = DTOValidator.validate(GetBookDto, request.query_params)
+  result = book_service.get_book_by_id(book_id, fields=params.get('fields'))
   return Response(result, status=status.HTTP_200_OK)
 
 @roles([UserRole.ADMIN])
@@ -39,17 +91,48 @@ def delete_book(request, book_id):
   book_service.delete_book(book_id)
   return Response({'message': 'Book deleted successfully'}, status=status.HTTP_200_OK)
 
+@roles([UserRole.ADMIN])
+def batch_update_books(request):
+  validated_data = DTOValidator.validate(BatchUpdateBooksDto, request.data)
+  result = book_service.batch_update_books(
+    validated_data['patch'],
+    ids=validated_data.get('ids'),
+    filters=validated_data.get('filter')
+  )
+  return Response(result, status=status.HTTP_200_OK)
+
+@roles([UserRole.ADMIN])
+def batch_delete_books(request):
+  validated_data = DTOValidator.validate(BatchDeleteBooksDto, request.data)
+  result = book_service.batch_delete_books(validated_data['ids'])
+  return Response(result, status=status.HTTP_200_OK)
+
 @roles([UserRole.ADMIN, UserRole.MANAGER])
 def get_google_books(request):
   filters = DTOValidator.validate(GoogleBooksDto, request.query_params)
   result = book_service.get_google_books(filters)
+  if filters['mode'] == 'passthrough':
+    # Relay Google's JSON bytes as they are, without decoding and re-rendering them
+    return HttpResponse(result.data, content_type=GOOGLE_BOOKS_CONTENT_TYPE, headers=result.headers())
+  return Response(result.data, status=status.HTTP_200_OK, headers=result.headers())
+
+@roles([UserRole.ADMIN])
+def import_google_books(request):
+  validated_data = DTOValidator.validate(ImportGoogleBooksDto, request.data)
+  result = book_service.import_google_books(
+    validated_data.pop('q'),
+    str(request.user.user_id),
+    max_items=validated_data.pop('max_items', None),
+    workers=validated_data.pop('workers', None),
+    params=validated_data
+  )
   return Response(result, status=status.HTTP_200_OK)
 
 @swagger_auto_schema(
   method='get',
   operation_summary="Get all books",
   query_serializer=GetBooksDto,
-  responses={200: 'List of books'}
+  responses={200: 'Page of books with next/prev cursors', 304: 'Not modified since the ETag sent'}
 )
 @swagger_auto_schema(
   method='post',
@@ -64,10 +147,51 @@ def books(request):
   else:  # POST
     return create_book(request)
 
+@swagger_auto_schema(
+  method='post',
+  operation_summary="Create many books in one request",
+  request_body=BulkCreateBooksDto,
+  responses={201: 'All books created', 207: 'Per-item results, some books were not created'}
+)
+@api_view(['POST'])
+def books_bulk(request):
+  return bulk_create_books(request)
+
+@swagger_auto_schema(
+  method='patch',
+  operation_summary="Apply one update to many books (by IDs or filter)",
+  request_body=BatchUpdateBooksDto,
+  responses={200: 'Matched and updated counts', 409: 'ISBN conflict'}
+)
+@api_view(['PATCH'])
+def books_batch(request):
+  return batch_update_books(request)
+
+@swagger_auto_schema(
+  method='post',
+  operation_summary="Soft delete many books by ID",
+  request_body=BatchDeleteBooksDto,
+  responses={200: 'Matched and deleted counts'}
+)
+@api_view(['POST'])
+def books_batch_delete(request):
+  return batch_delete_books(request)
+
+@swagger_auto_schema(
+  method='get',
+  operation_summary="Export all books as a stream (NDJSON or CSV)",
+  query_serializer=ExportBooksDto,
+  responses={200: 'Streamed NDJSON or CSV file'}
+)
+@api_view(['GET'])
+def books_export(request):
+  return export_books(request)
+
 @swagger_auto_schema(
   method='get',
   operation_summary="Get a book by ID",
-  responses={200: 'Book details', 404: 'Book not found'}
+  query_serializer=GetBookDto,
+  responses={200: 'Book details', 304: 'Not modified since the ETag / Last-Modified sent', 404: 'Book not found'}
 )
 @swagger_auto_schema(
   method='patch',
@@ -98,3 +222,24 @@ def book_detail(request, book_id):
 @api_view(['GET'])
 def google_books(request):
   return get_google_books(request)
+
+@swagger_auto_schema(
+  method='post',
+  operation_summary="Import Google Books search results into the catalog",
+  request_body=ImportGoogleBooksDto,
+  responses={200: 'Import report: created and skipped counts, throughput'}
+)
+@api_view(['POST'])
+def google_books_import(request):
+  return import_google_books(request)
+
+# Native async view (served on the event loop under ASGI); not in the Swagger schema,
+# parameters and response are the same as GET /api/v1/books/google
+@async_api_view(['GET'])
+@roles([UserRole.ADMIN, UserRole.MANAGER])
+async def google_books_async(request):
+  filters = DTOValidator.validate(GoogleBooksDto, request.GET)
+  result = await book_service.aget_google_books(filters)
+  if filters['mode'] == 'passthrough':
+    return HttpResponse(result.data, content_type=GOOGLE_BOOKS_CONTENT_TYPE, headers=result.headers())
+  return JsonResponse(result.data, headers=result.headers())
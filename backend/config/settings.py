@@ -140,6 +140,27 @@ STATIC_URL = 'static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# 'books' holds book detail lookups and the catalog generation; point it at a shared backend (e.g. Redis)
+# so entries and invalidations reach every worker
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'default',
+    },
+    'books': {
+        'BACKEND': os.getenv('BOOKS_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('BOOKS_CACHE_LOCATION', 'books'),
+        'TIMEOUT': int(os.getenv('BOOKS_CACHE_TIMEOUT', '300')),
+        'OPTIONS': {
+            # Least recently used entries are evicted beyond this size (locmem/filebased/db backends)
+            'MAX_ENTRIES': int(os.getenv('BOOKS_CACHE_MAX_ENTRIES', '10000')),
+        },
+    },
+}
+
 # Django REST Framework settings
 REST_FRAMEWORK = {
     'EXCEPTION_HANDLER': 'utils.exception_handler.custom_exception_handler',
@@ -175,6 +196,110 @@ SWAGGER_SETTINGS = {
 # JWT Settings
 JWT_SECRET_KEY = get_env('JWT_SECRET_KEY')
 JWT_EXPIRY_DAYS = int(get_env('JWT_EXPIRY_DAYS'))
+# Verified tokens remembered per worker, so repeat requests skip signature verification (0 disables)
+JWT_VERIFIED_CACHE_MAX_ENTRIES = int(os.getenv('JWT_VERIFIED_CACHE_MAX_ENTRIES', '10000'))
+# Longest a verified token is trusted without re-verifying, in seconds (entries also expire at the token's exp)
+JWT_VERIFIED_CACHE_TIMEOUT = int(os.getenv('JWT_VERIFIED_CACHE_TIMEOUT', '300'))
+
+# Password hashing
+# bcrypt cost factor for new hashes; stored hashes with another cost are rehashed on successful login
+BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', '10'))
+# Threads per worker that run bcrypt (0 runs it on the request thread), and logins/signups
+# that may wait for one before further ones are rejected with 503
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', '2'))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv('PASSWORD_HASH_MAX_QUEUE', '16'))
+
+# Rate limits for login and signup, per client IP and per email, over a sliding window of the given seconds (0 disables a limit)
+LOGIN_RATE_LIMIT_PER_IP = int(os.getenv('LOGIN_RATE_LIMIT_PER_IP', '30'))
+LOGIN_RATE_LIMIT_PER_EMAIL = int(os.getenv('LOGIN_RATE_LIMIT_PER_EMAIL', '10'))
+LOGIN_RATE_LIMIT_WINDOW = int(os.getenv('LOGIN_RATE_LIMIT_WINDOW', '60'))
+SIGNUP_RATE_LIMIT_PER_IP = int(os.getenv('SIGNUP_RATE_LIMIT_PER_IP', '10'))
+SIGNUP_RATE_LIMIT_PER_EMAIL = int(os.getenv('SIGNUP_RATE_LIMIT_PER_EMAIL', '3'))
+SIGNUP_RATE_LIMIT_WINDOW = int(os.getenv('SIGNUP_RATE_LIMIT_WINDOW', '3600'))
+# Cache alias holding rate limit counters, e.g. 'books' when it is a shared backend
+# (empty: counters are kept per worker process, so each worker allows the full limit)
+RATE_LIMIT_CACHE = os.getenv('RATE_LIMIT_CACHE', '')
+# Counters kept by the in-process store before the least recently used are dropped
+RATE_LIMIT_LOCAL_MAX_KEYS = int(os.getenv('RATE_LIMIT_LOCAL_MAX_KEYS', '100000'))
+# Reverse proxies in front of the app that append to X-Forwarded-For (0: use the socket address)
+RATE_LIMIT_TRUSTED_PROXIES = int(os.getenv('RATE_LIMIT_TRUSTED_PROXIES', '0'))
+
+# Seconds a user's public fields (embedded in book responses) stay cached
+USER_SUMMARY_CACHE_TIMEOUT = int(os.getenv('USER_SUMMARY_CACHE_TIMEOUT', '300'))
+
+# Book catalog settings
+# Rows fetched per server-side cursor round trip when streaming an export
+BOOKS_EXPORT_CHUNK_SIZE = int(os.getenv('BOOKS_EXPORT_CHUNK_SIZE', '2000'))
+# Maximum number of books accepted by one bulk create request
+BOOKS_BULK_MAX_ITEMS = int(os.getenv('BOOKS_BULK_MAX_ITEMS', '5000'))
+# Rows per INSERT statement for bulk create (overridable per request with batch_size)
+BOOKS_BULK_BATCH_SIZE = int(os.getenv('BOOKS_BULK_BATCH_SIZE', '500'))
+# Whether the 'books' cache lives in each worker process, where invalidations do not reach other workers
+books_cache_per_process = CACHES['books']['BACKEND'].rsplit('.', 1)[-1] in ('LocMemCache', 'DummyCache')
+# Seconds a book detail row stays in the 'books' cache (0 disables the detail cache).
+# A write deletes the row from the writing worker's cache only unless that cache is shared,
+# so the detail cache is off by default with locmem/dummy
+BOOKS_DETAIL_CACHE_TIMEOUT = int(os.getenv(
+    'BOOKS_DETAIL_CACHE_TIMEOUT',
+    '0' if books_cache_per_process else str(CACHES['books']['TIMEOUT'])
+))
+# Seconds a "book not found" result stays cached
+BOOKS_CACHE_NEGATIVE_TIMEOUT = int(os.getenv('BOOKS_CACHE_NEGATIVE_TIMEOUT', '30'))
+# Seconds a books list page stays cached per worker (0 disables the list cache).
+# Writes invalidate cached lists through a counter in the 'books' cache, which only reaches
+# other workers when that cache is shared, so the list cache is off by default with locmem/dummy
+BOOKS_LIST_CACHE_TIMEOUT = int(os.getenv('BOOKS_LIST_CACHE_TIMEOUT', '0' if books_cache_per_process else '60'))
+# Memory budget of the per-worker books list cache, in bytes of pickled results
+BOOKS_LIST_CACHE_MAX_BYTES = int(os.getenv('BOOKS_LIST_CACHE_MAX_BYTES', str(32 * 1024 * 1024)))
+
+# Google Books API client
+GOOGLE_BOOKS_API_URL = os.getenv('GOOGLE_BOOKS_API_URL', 'https://www.googleapis.com/books/v1/volumes')
+# Seconds to establish the TCP+TLS connection, and to wait for response data once connected
+GOOGLE_BOOKS_CONNECT_TIMEOUT = float(os.getenv('GOOGLE_BOOKS_CONNECT_TIMEOUT', '3.05'))
+GOOGLE_BOOKS_READ_TIMEOUT = float(os.getenv('GOOGLE_BOOKS_READ_TIMEOUT', '10'))
+# Keep-alive connections kept per worker process (size it to the worker's thread count)
+GOOGLE_BOOKS_POOL_SIZE = int(os.getenv('GOOGLE_BOOKS_POOL_SIZE', '10'))
+# Connections the async client (GET /api/v1/books/google/async) may open per event loop
+GOOGLE_BOOKS_ASYNC_MAX_CONNECTIONS = int(os.getenv('GOOGLE_BOOKS_ASYNC_MAX_CONNECTIONS', '200'))
+# Retries on connection errors, 429 and 5xx, with jittered exponential backoff of about GOOGLE_BOOKS_RETRY_BACKOFF * 2^n seconds
+GOOGLE_BOOKS_MAX_RETRIES = int(os.getenv('GOOGLE_BOOKS_MAX_RETRIES', '2'))
+GOOGLE_BOOKS_RETRY_BACKOFF = float(os.getenv('GOOGLE_BOOKS_RETRY_BACKOFF', '0.3'))
+# Total seconds one Google Books call may take, all retries included
+GOOGLE_BOOKS_DEADLINE = float(os.getenv('GOOGLE_BOOKS_DEADLINE', '5'))
+# Consecutive failed calls that open the circuit, seconds it stays open, and trial calls let through afterwards
+GOOGLE_BOOKS_BREAKER_FAILURE_THRESHOLD = int(os.getenv('GOOGLE_BOOKS_BREAKER_FAILURE_THRESHOLD', '5'))
+GOOGLE_BOOKS_BREAKER_RECOVERY_TIMEOUT = int(os.getenv('GOOGLE_BOOKS_BREAKER_RECOVERY_TIMEOUT', '30'))
+GOOGLE_BOOKS_BREAKER_HALF_OPEN_MAX_CALLS = int(os.getenv('GOOGLE_BOOKS_BREAKER_HALF_OPEN_MAX_CALLS', '1'))
+# Seconds a Google Books response is served from the per-worker cache without asking upstream (0 disables)
+GOOGLE_BOOKS_CACHE_TIMEOUT = int(os.getenv('GOOGLE_BOOKS_CACHE_TIMEOUT', '300'))
+# Seconds past that a response is still served while it is refreshed in the background
+GOOGLE_BOOKS_CACHE_STALE_WHILE_REVALIDATE = int(os.getenv('GOOGLE_BOOKS_CACHE_STALE_WHILE_REVALIDATE', '600'))
+# Seconds past that a response is still served when the upstream request fails
+GOOGLE_BOOKS_CACHE_STALE_IF_ERROR = int(os.getenv('GOOGLE_BOOKS_CACHE_STALE_IF_ERROR', '3600'))
+GOOGLE_BOOKS_CACHE_MAX_ENTRIES = int(os.getenv('GOOGLE_BOOKS_CACHE_MAX_ENTRIES', '1000'))
+GOOGLE_BOOKS_CACHE_MAX_BYTES = int(os.getenv('GOOGLE_BOOKS_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+# Cache alias used to coalesce identical upstream calls across worker processes, e.g. 'books' when it
+# is a shared backend (empty: coalesce across the threads of each worker only)
+GOOGLE_BOOKS_COALESCE_CACHE = os.getenv('GOOGLE_BOOKS_COALESCE_CACHE', '')
+# Seconds before the cross-process lock of a crashed leader expires
+GOOGLE_BOOKS_COALESCE_LOCK_TIMEOUT = int(os.getenv('GOOGLE_BOOKS_COALESCE_LOCK_TIMEOUT', '30'))
+# Volume fields returned by GET /api/v1/books/google?mode=trimmed, as Google partial response paths
+GOOGLE_BOOKS_TRIMMED_FIELDS = os.getenv(
+    'GOOGLE_BOOKS_TRIMMED_FIELDS',
+    'id,volumeInfo/title,volumeInfo/subtitle,volumeInfo/authors,volumeInfo/publishedDate,'
+    'volumeInfo/description,volumeInfo/imageLinks/thumbnail'
+).split(',')
+# Seconds between warm-up runs that refresh popular Google Books queries before they expire (0 disables)
+GOOGLE_BOOKS_WARMUP_INTERVAL = int(os.getenv('GOOGLE_BOOKS_WARMUP_INTERVAL', '60'))
+# Most requested queries considered per run, and upstream calls a run may make
+GOOGLE_BOOKS_WARMUP_TOP_N = int(os.getenv('GOOGLE_BOOKS_WARMUP_TOP_N', '200'))
+GOOGLE_BOOKS_WARMUP_BUDGET = int(os.getenv('GOOGLE_BOOKS_WARMUP_BUDGET', '20'))
+# Distinct queries whose frequency is tracked, and seconds after which a request counts half
+GOOGLE_BOOKS_WARMUP_TRACKED_QUERIES = int(os.getenv('GOOGLE_BOOKS_WARMUP_TRACKED_QUERIES', '5000'))
+GOOGLE_BOOKS_WARMUP_HALF_LIFE = int(os.getenv('GOOGLE_BOOKS_WARMUP_HALF_LIFE', '3600'))
+# Volumes fetched by one Google Books import, and pages fetched concurrently
+GOOGLE_BOOKS_IMPORT_MAX_ITEMS = int(os.getenv('GOOGLE_BOOKS_IMPORT_MAX_ITEMS', '400'))
+GOOGLE_BOOKS_IMPORT_WORKERS = int(os.getenv('GOOGLE_BOOKS_IMPORT_WORKERS', '4'))
 
 # Logging configuration
 LOGGING = {
@@ -0,0 +1,42 @@
+from functools import wraps
+from asgiref.sync import markcoroutinefunction
+from django.http import JsonResponse
+from utils.exception_handler import custom_exception_handler
+from utils.exceptions import BaseAPIException, MethodNotAllowedException
+
+
+def async_api_view(http_method_names):
+    """
+    Decorator for native async views, the counterpart of DRF's @api_view
+    (which only supports sync views).
+
+    Rejects other HTTP methods with 405 and renders BaseAPIException errors
+    through custom_exception_handler, so responses have the same shape and
+    headers as the DRF views. The view returns a Django HttpResponse
+    (e.g. JsonResponse) and reads query parameters from request.GET.
+
+    Usage:
+        @async_api_view(['GET'])
+        @roles([UserRole.ADMIN])
+        async def async_view(request):
+            return JsonResponse({...})
+    """
+    allowed_methods = [method.upper() for method in http_method_names]
+
+    def decorator(view_func):
+        @wraps(view_func)
+        async def wrapped_view(request, *args, **kwargs):
+            try:
+                if request.method not in allowed_methods:
+                    raise MethodNotAllowedException(f'Method "{request.method}" not allowed.')
+                return await view_func(request, *args, **kwargs)
+            except BaseAPIException as exc:
+                drf_response = custom_exception_handler(exc, {'request': request, 'view': None})
+                response = JsonResponse(drf_response.data, status=drf_response.status_code, safe=False)
+                for header, value in drf_response.items():
+                    if header.lower() != 'content-type':
+                        response[header] = value
+                return response
+
+        return markcoroutinefunction(wrapped_view)
+    return decorator
@@ -0,0 +1,53 @@
+from functools import wraps
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+def conditional(validators):
+    """
+    Decorator adding ETag / Last-Modified validators and conditional GET to a view.
+
+    validators(request, *args, **kwargs) returns (etag, last_modified) computed
+    cheaply (e.g. from an aggregate or a cached row), or None to skip. When the
+    request's If-None-Match / If-Modified-Since match, 304 Not Modified is
+    returned without calling the view, so its query and serialization never run.
+    Otherwise the view runs and the validators are added to its response,
+    with Cache-Control: private, no-cache so clients revalidate every time.
+
+    Like Django's @condition, but with one function computing both
+    validators, so a single query can produce them.
+
+    Usage:
+        @conditional(lambda request, book_id: book_service.get_book_validators(book_id))
+        def get_book_by_id(request, book_id):
+            pass
+
+    Args:
+        validators: Callable returning (etag or None, last_modified datetime or None) or None
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapped_view(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view_func(request, *args, **kwargs)
+
+            result = validators(request, *args, **kwargs)
+            etag, last_modified = result if result is not None else (None, None)
+            etag = quote_etag(etag) if etag else None
+            timestamp = int(last_modified.timestamp()) if last_modified else None
+
+            response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+            if response is None:
+                response = view_func(request, *args, **kwargs)
+
+            if response.status_code in (200, 304):
+                if etag:
+                    response.headers.setdefault('ETag', etag)
+                if timestamp is not None:
+                    response.headers.setdefault('Last-Modified', http_date(timestamp))
+                if not response.has_header('Cache-Control'):
+                    patch_cache_control(response, private=True, no_cache=True)
+            return response
+
+        return wrapped_view
+    return decorator
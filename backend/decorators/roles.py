@@ -1,4 +1,5 @@
 from functools import wraps
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from user.models import UserRole
 from utils.exceptions import ForbiddenException, UnauthorizedException
 
@@ -23,6 +24,11 @@ def roles(allowed_roles):
         def admin_or_manager_view(request):
             pass
 
+        @async_api_view(['GET'])
+        @roles([UserRole.ADMIN])
+        async def async_admin_view(request):
+            pass
+
     Raises:
         UnauthorizedException: If user is not authenticated
         ForbiddenException: If user's role is not in allowed_roles
@@ -34,18 +40,30 @@ def roles(allowed_roles):
     # Convert UserRole enum values to their string values for comparison
     allowed_role_values = [role.value if hasattr(role, 'value') else str(role) for role in allowed_roles]
 
+    def check_role(request):
+        user = getattr(request, '_user', None)
+        user_role = getattr(user, 'role', None)
+        if not user_role:
+            raise ForbiddenException('User role not found.')
+
+        # Check if user's role is in allowed roles
+        if user_role not in allowed_role_values:
+            role_names = ', '.join([role.value if hasattr(role, 'value') else str(role) for role in allowed_roles])
+            raise ForbiddenException(f'Access denied. Required roles: {role_names}')
+
     def decorator(view_func):
+        # Async views stay coroutine functions, so Django runs them on the event loop
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapped_view(request, *args, **kwargs):
+                check_role(request)
+                return await view_func(request, *args, **kwargs)
+
+            return markcoroutinefunction(async_wrapped_view)
+
         @wraps(view_func)
         def wrapped_view(request, *args, **kwargs):
-            user = getattr(request, '_user', None)
-            user_role = getattr(user, 'role', None)
-            if not user_role:
-                raise ForbiddenException('User role not found.')
-
-            # Check if user's role is in allowed roles
-            if user_role not in allowed_role_values:
-                role_names = ', '.join([role.value if hasattr(role, 'value') else str(role) for role in allowed_roles])
-                raise ForbiddenException(f'Access denied. Required roles: {role_names}')
+            check_role(request)
 
             # User has required role, proceed with view
             return view_func(request, *args, **kwargs)
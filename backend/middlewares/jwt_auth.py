@@ -1,10 +1,95 @@
+import hashlib
+import threading
+import time
 from types import SimpleNamespace
 import jwt
+from django.core.signals import setting_changed
 from django.utils.deprecation import MiddlewareMixin
 from django.conf import settings
-from django.urls import resolve
 from utils.exceptions import UnauthorizedException, BaseAPIException
 from utils.exception_handler import custom_exception_handler
+from utils.lru_cache import LRUCache
+
+
+class VerifiedTokenCache:
+    """
+    Per-worker LRU of tokens that already passed jwt.decode, so a client sending
+    the same token again skips the signature check, JSON parsing and claim checks.
+
+    Entries are keyed by the token's SHA-256 digest (tokens themselves are not kept),
+    hold the user built from the payload, and expire at the token's exp, capped at
+    JWT_VERIFIED_CACHE_TIMEOUT seconds. Only valid tokens are cached, so rejected
+    tokens always go through jwt.decode. The cache is flushed when JWT_SECRET_KEY
+    changes, so tokens signed with a rotated-out secret stop being accepted.
+
+    Usage:
+        user = verified_token_cache.get(token)
+        if user is None:
+            user = SimpleNamespace(**jwt.decode(...))
+            verified_token_cache.set(token, user)
+    """
+
+    def __init__(self):
+        self._cache = None
+        self._secret = None
+        self._lock = threading.Lock()
+
+    def get(self, token):
+        """Return the cached user for token, or None if not cached, expired or caching is disabled"""
+        cache = self._current()
+        if cache is None:
+            return None
+        user = cache.get(self._key(token))
+        # exp is checked on the wall clock too, in case it moved since the entry was cached
+        if user is not None and getattr(user, 'exp', None) is not None and user.exp <= time.time():
+            cache.delete(self._key(token))
+            return None
+        return user
+
+    def set(self, token, user):
+        cache = self._current()
+        if cache is None:
+            return
+        timeout = settings.JWT_VERIFIED_CACHE_TIMEOUT
+        exp = getattr(user, 'exp', None)
+        if exp is not None:
+            timeout = min(timeout, exp - time.time())
+        if timeout > 0:
+            cache.set(self._key(token), user, ttl=timeout)
+
+    def clear(self):
+        with self._lock:
+            self._cache = None
+            self._secret = None
+
+    def __len__(self):
+        return len(self._cache) if self._cache is not None else 0
+
+    def _current(self):
+        secret = settings.JWT_SECRET_KEY
+        if self._cache is not None and self._secret == secret:
+            return self._cache
+        with self._lock:
+            if self._cache is None or self._secret != secret:
+                max_entries = settings.JWT_VERIFIED_CACHE_MAX_ENTRIES
+                self._cache = LRUCache(max_entries=max_entries) if max_entries > 0 else None
+                self._secret = secret
+            return self._cache
+
+    @staticmethod
+    def _key(token):
+        return hashlib.sha256(token.encode('utf-8')).digest()
+
+
+verified_token_cache = VerifiedTokenCache()
+
+
+def _flush_verified_tokens(setting, **kwargs):
+    if setting.startswith('JWT_'):
+        verified_token_cache.clear()
+
+
+setting_changed.connect(_flush_verified_tokens)
 
 class JWTAuthMiddleware(MiddlewareMixin):
     """
@@ -13,39 +98,32 @@ class JWTAuthMiddleware(MiddlewareMixin):
     Applied globally to all routes unless marked as public with @is_public decorator.
     """
 
-    def process_request(self, request):
+    # Paths served without authentication: Django admin, static and media files, API docs
+    EXEMPT_PATH_PREFIXES = ('/admin', '/static', '/media', '/swagger', '/redoc')
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        # view function -> whether it is marked public, filled on first request to each view
+        self._public_views = {}
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # Runs after URL resolution, so the view Django is about to call is checked
+        # directly instead of resolving the path a second time
+
         # Skip for OPTIONS requests (CORS preflight)
         if request.method == 'OPTIONS':
             return None
 
-        # Skip for Django admin, static files, and media files
-        if (request.path.startswith('/admin') or
-            request.path.startswith('/static') or
-            request.path.startswith('/media') or
-            request.path.startswith('/swagger') or
-            request.path.startswith('/redoc')):
+        # Skip for Django admin, static files, media files and API docs
+        if request.path.startswith(self.EXEMPT_PATH_PREFIXES):
             return None
 
         # Check if the view function is marked as public
-        try:
-            resolved = resolve(request.path)
-            view_func = resolved.func
-
-            # Check if view has _is_public attribute (set by @is_public decorator)
-            # Also check wrapped functions (for @api_view decorator)
-            if hasattr(view_func, '_is_public') and view_func._is_public:
-                return None
-
-            # Check if the underlying function is marked as public
-            # This handles cases where @api_view wraps the function
-            if hasattr(view_func, 'cls') and hasattr(view_func.cls, '_is_public'):
-                return None
-            if hasattr(view_func, 'view_class') and hasattr(view_func.view_class, '_is_public'):
-                return None
-
-        except Exception:
-            # If URL resolution fails, continue with auth check
-            pass
+        is_public = self._public_views.get(view_func)
+        if is_public is None:
+            is_public = self._public_views[view_func] = self._is_public_view(view_func)
+        if is_public:
+            return None
 
         # Skip authentication if explicitly marked (for cases where decorator runs)
         if hasattr(request, 'skip_auth') and request.skip_auth:
@@ -70,6 +148,12 @@ class JWTAuthMiddleware(MiddlewareMixin):
             exc = UnauthorizedException('Invalid token header format. Use: Bearer <token>')
             return self._handle_exception(request, exc)
 
+        # Reuse the user of a token verified earlier
+        user = verified_token_cache.get(token)
+        if user is not None:
+            request._user = user
+            return None
+
         # Verify and decode token
         try:
             payload = jwt.decode(
@@ -83,6 +167,7 @@ class JWTAuthMiddleware(MiddlewareMixin):
                 exc = UnauthorizedException('Invalid token payload.')
                 return self._handle_exception(request, exc)
             user = SimpleNamespace(**payload)
+            verified_token_cache.set(token, user)
             request._user = user
 
         except jwt.ExpiredSignatureError:
@@ -103,6 +188,21 @@ class JWTAuthMiddleware(MiddlewareMixin):
 
         return None
 
+    @staticmethod
+    def _is_public_view(view_func):
+        # Check if view has _is_public attribute (set by @is_public decorator)
+        # Also check wrapped functions (for @api_view decorator)
+        if getattr(view_func, '_is_public', False):
+            return True
+
+        # Check if the underlying function is marked as public
+        # This handles cases where @api_view wraps the function
+        if hasattr(view_func, 'cls') and hasattr(view_func.cls, '_is_public'):
+            return True
+        if hasattr(view_func, 'view_class') and hasattr(view_func.view_class, '_is_public'):
+            return True
+        return False
+
     def _handle_exception(self, request, exception):
         """
         Handle exceptions by routing them through the exception handler.
@@ -0,0 +1,61 @@
+import statistics
+import time
+import uuid
+from types import SimpleNamespace
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from django.urls import resolve
+from middlewares.jwt_auth import JWTAuthMiddleware, verified_token_cache
+from user.services import UserService
+
+
+class Command(BaseCommand):
+  help = (
+    'Measure JWTAuthMiddleware overhead per authenticated request, '
+    'with and without the verified-token cache.'
+  )
+
+  def add_arguments(self, parser):
+    parser.add_argument('--requests', type=int, default=20000, help='Requests per run')
+    parser.add_argument('--tokens', type=int, default=100, help='Distinct tokens the requests rotate through')
+    parser.add_argument('--path', default='/api/v1/books', help='Protected path the requests target')
+
+  def handle(self, *args, **options):
+    user_service = UserService()
+    tokens = [
+      user_service.generate_token(SimpleNamespace(id=uuid.uuid4(), email=f'user{index}@example.com', role='USER'))
+      for index in range(options['tokens'])
+    ]
+    factory = RequestFactory()
+    requests = [
+      factory.get(options['path'], HTTP_AUTHORIZATION=f'Bearer {tokens[index % len(tokens)]}')
+      for index in range(options['requests'])
+    ]
+    middleware = JWTAuthMiddleware(lambda request: None)
+    # Django resolves the URL before process_view runs, so resolution is not timed
+    view_func = resolve(options['path']).func
+
+    with override_settings(JWT_VERIFIED_CACHE_MAX_ENTRIES=0):
+      self._report('uncached', self._run(middleware, view_func, requests))
+    verified_token_cache.clear()
+    self._report('cached', self._run(middleware, view_func, requests))
+    verified_token_cache.clear()
+
+  def _run(self, middleware, view_func, requests):
+    latencies = []
+    for request in requests:
+      started = time.perf_counter()
+      response = middleware.process_view(request, view_func, (), {})
+      latencies.append(time.perf_counter() - started)
+      if response is not None:
+        raise RuntimeError(f'Request rejected with status {response.status_code}')
+    return latencies
+
+  def _report(self, name, latencies):
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    self.stdout.write(
+      f'{name:>8}: {len(latencies)} requests, mean {statistics.mean(latencies) * 1e6:.1f}us, '
+      f'p50 {statistics.median(latencies) * 1e6:.1f}us, p99 {p99 * 1e6:.1f}us'
+    )
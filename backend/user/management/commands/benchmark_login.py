@@ -0,0 +1,80 @@
+import statistics
+import threading
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings
+from book.services import BookService
+from user import services as user_services
+from user.services import UserService
+from utils.bounded_executor import BoundedExecutor
+from utils.exceptions import ServiceUnavailableException
+
+
+class Command(BaseCommand):
+  help = (
+    'Measure password verification throughput and book list latency while both run at once, '
+    'with bcrypt inline on the request threads and on the bounded password hashing pool. '
+    'Reads the books table; writes nothing.'
+  )
+
+  def add_arguments(self, parser):
+    parser.add_argument('--login-threads', type=int, default=8, help='Threads verifying passwords in a loop')
+    parser.add_argument('--read-threads', type=int, default=4, help='Threads listing books in a loop')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds per run')
+
+  def handle(self, *args, **options):
+    hashed = UserService().hash_password('benchmark-password')
+    pooled = user_services.password_hasher
+    try:
+      with override_settings(BOOKS_LIST_CACHE_TIMEOUT=0):
+        for name, hasher in (('inline', BoundedExecutor('benchmark.inline', 0, 0)), ('pooled', pooled)):
+          user_services.password_hasher = hasher
+          self._report(name, self._run(hashed, options))
+    finally:
+      user_services.password_hasher = pooled
+
+  def _run(self, hashed, options):
+    deadline = time.monotonic() + options['duration']
+    logins, rejected, reads = [], [], []
+    user_service = UserService()
+    book_service = BookService()
+
+    def login():
+      while time.monotonic() < deadline:
+        started = time.perf_counter()
+        try:
+          user_service.verify_password('benchmark-password', hashed)
+        except ServiceUnavailableException:
+          rejected.append(1)
+          time.sleep(0.01)
+          continue
+        logins.append(time.perf_counter() - started)
+
+    def read():
+      try:
+        while time.monotonic() < deadline:
+          started = time.perf_counter()
+          book_service.get_books({'limit': 20})
+          reads.append(time.perf_counter() - started)
+      finally:
+        connection.close()
+
+    threads = [threading.Thread(target=login) for _ in range(options['login_threads'])]
+    threads += [threading.Thread(target=read) for _ in range(options['read_threads'])]
+    for thread in threads:
+      thread.start()
+    for thread in threads:
+      thread.join()
+    return options['duration'], logins, len(rejected), reads
+
+  def _report(self, name, run):
+    duration, logins, rejected, reads = run
+    reads = sorted(reads) or [0]
+    p99 = reads[min(len(reads) - 1, int(len(reads) * 0.99))]
+    self.stdout.write(
+      f'{name:>6}: {len(logins) / duration:.1f} logins/s ({rejected} rejected with 503, '
+      f'bcrypt cost {settings.BCRYPT_ROUNDS}), {len(reads) / duration:.1f} book reads/s, '
+      f'read p50 {statistics.median(reads) * 1000:.1f}ms, p99 {p99 * 1000:.1f}ms'
+    )
@@ -0,0 +1,26 @@
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+from utils.models.operations import PostgreSQLOnly
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('user', '0001_initial'),
+    ]
+
+    operations = [
+        PostgreSQLOnly(
+            AddIndexConcurrently(
+                model_name='user',
+                index=models.Index(
+                    condition=models.Q(('deleted_at', None)),
+                    fields=['email'],
+                    name='users_live_email_idx',
+                ),
+            )
+        ),
+    ]
@@ -20,6 +20,8 @@ class User(models.Model):
     db_table = 'users'
     indexes = [
       models.Index(fields=['role']),
+      # Serves get_user_by_email, which only looks up live (not soft-deleted) users
+      models.Index(fields=['email'], name='users_live_email_idx', condition=models.Q(deleted_at=None)),
     ]
 
     def __str__(self):
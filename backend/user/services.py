@@ -2,28 +2,53 @@ import bcrypt
 import jwt
 from datetime import datetime, timedelta, timezone
 from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError
 from user.models import User
 from django.utils import timezone as django_timezone
-from utils.exceptions import ConflictException, NotFoundException, UnauthorizedException
+from utils.bounded_executor import BoundedExecutor
+from utils.db import is_unique_violation
+from utils.exceptions import ConflictException, NotFoundException, ServiceUnavailableException, UnauthorizedException
+
+# bcrypt releases the GIL, so a few threads give hashing real parallelism while
+# capping the CPU it takes away from other requests
+password_hasher = BoundedExecutor(
+  'users.password_hash',
+  max_workers=settings.PASSWORD_HASH_WORKERS,
+  max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
+
+# bcrypt cost -> hash checked against when the email is unknown, so a login for a
+# missing user takes as long as one with a wrong password
+_dummy_password_hashes = {}
 
 class UserService:
   def create_user(self, dto):
-    existing_user = self.get_user_by_email(dto['email'])
-    if existing_user:
-      raise ConflictException('User with this email already exists')
     dto['password'] = self.hash_password(dto['password'])
-    user = User.objects.create(**dto)
+    # A single INSERT; an existing email surfaces as a unique violation,
+    # so there is no pre-check query and no window between it and the insert
+    try:
+      user = User.objects.create(**dto)
+    except IntegrityError as e:
+      if self._is_email_conflict(e):
+        raise ConflictException('User with this email already exists')
+      raise
     token = self.generate_token(user)
-    # Get user data using values() to exclude password
-    user_data = User.objects.filter(id=user.id).values(
-      'id',
-      'email',
-      'name',
-      'role'
-    ).first()
     return {
       'token': token,
-      'user': dict(user_data) if user_data else None,
+      'user': self._user_data(user),
+    }
+
+  def _is_email_conflict(self, error) -> bool:
+    return is_unique_violation(error, User, 'email')
+
+  def _user_data(self, user) -> dict:
+    # Public fields of a loaded user, without the password
+    return {
+      'id': user.id,
+      'email': user.email,
+      'name': user.name,
+      'role': user.role,
     }
 
   def generate_token(self, user) -> str:
@@ -53,9 +78,15 @@ class UserService:
     return token
 
   def hash_password(self, password) -> str:
+    """
+    Hash password with bcrypt at BCRYPT_ROUNDS, on the password hashing pool
+
+    Raises:
+        ServiceUnavailableException: If the password hashing pool is saturated
+    """
     password_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt(10)
-    hashed = bcrypt.hashpw(password_bytes, salt)
+    salt = bcrypt.gensalt(settings.BCRYPT_ROUNDS)
+    hashed = password_hasher.run(bcrypt.hashpw, password_bytes, salt)
     return hashed.decode('utf-8')
 
   def verify_password(self, password: str, hashed_password: str) -> bool:
@@ -68,10 +99,36 @@ class UserService:
 
     Returns:
         bool: True if password matches, False otherwise
+
+    Raises:
+        ServiceUnavailableException: If the password hashing pool is saturated
     """
     password_bytes = password.encode('utf-8')
     hashed_bytes = hashed_password.encode('utf-8')
-    return bcrypt.checkpw(password_bytes, hashed_bytes)
+    return password_hasher.run(bcrypt.checkpw, password_bytes, hashed_bytes)
+
+  def needs_rehash(self, hashed_password: str) -> bool:
+    """
+    Whether a bcrypt hash ($2b$<cost>$...) was made with a cost other than BCRYPT_ROUNDS
+    """
+    try:
+      return int(hashed_password.split('$')[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+      return False
+
+  def _dummy_password_hash(self) -> str:
+    rounds = settings.BCRYPT_ROUNDS
+    if rounds not in _dummy_password_hashes:
+      _dummy_password_hashes[rounds] = self.hash_password('dummy-password')
+    return _dummy_password_hashes[rounds]
+
+  def _rehash_password(self, user, password) -> None:
+    # Best effort: the login already succeeded, so a busy pool just postpones the upgrade
+    try:
+      hashed = self.hash_password(password)
+    except ServiceUnavailableException:
+      return
+    User.objects.filter(id=user.id, password=user.password).update(password=hashed)
 
   def login(self, dto):
     """
@@ -85,33 +142,32 @@ class UserService:
 
     Raises:
         UnauthorizedException: If user not found or password is incorrect
+        ServiceUnavailableException: If the password hashing pool is saturated
     """
     email = dto['email']
     password = dto['password']
 
-    # Check if user exists
+    # One query reads every column the response needs
     user = self.get_user_by_email(email)
     if not user:
-      raise NotFoundException('User not found')
+      # Same bcrypt work and same error as a wrong password, so responses don't reveal which emails exist
+      self.verify_password(password, self._dummy_password_hash())
+      raise UnauthorizedException('Invalid email or password')
 
     # Verify password
     if not self.verify_password(password, user.password):
       raise UnauthorizedException('Invalid email or password')
 
+    # Upgrade hashes made with an older cost factor while the plain password is at hand
+    if self.needs_rehash(user.password):
+      self._rehash_password(user, password)
+
     # Generate token
     token = self.generate_token(user)
 
-    # Get user data using values() to exclude password
-    user_data = User.objects.filter(id=user.id).values(
-      'id',
-      'email',
-      'name',
-      'role'
-    ).first()
-
     return {
       'token': token,
-      'user': dict(user_data) if user_data else None,
+      'user': self._user_data(user),
     }
 
   def get_user_by_email(self, email):
@@ -128,6 +184,28 @@ class UserService:
     except User.DoesNotExist:
       raise NotFoundException('User not found')
 
+  def get_user_summary(self, id) -> dict:
+    """
+    Get a user's public fields (id, email, name, role) through the cache.
+    Used to embed the adding user in book responses without a join.
+
+    Args:
+        id: User ID
+
+    Returns:
+        dict: User data without password, or None if the user does not exist
+    """
+    cache_key = self._user_summary_cache_key(id)
+    user_data = cache.get(cache_key)
+    if user_data is None:
+      user_data = User.objects.filter(id=id).values('id', 'email', 'name', 'role').first()
+      if user_data:
+        cache.set(cache_key, user_data, settings.USER_SUMMARY_CACHE_TIMEOUT)
+    return user_data
+
+  def _user_summary_cache_key(self, id) -> str:
+    return f'user:summary:{id}'
+
   def get_all_users(self):
     users = User.objects.filter(deleted_at=None)
     return users
@@ -140,3 +218,5 @@ class UserService:
 
     if updated_count == 0:
       raise NotFoundException('User not found or already deleted')
+
+    cache.delete(self._user_summary_cache_key(id))
@@ -7,8 +7,20 @@ from dto.email_password_dto import EmailPasswordDto
 from user.services import UserService
 from utils.dto_validator import DTOValidator
 from decorators.is_public import is_public
+from django.conf import settings
+from utils.rate_limit import RateLimiter, client_ip
 
 user_service = UserService()
+login_rate_limiter = RateLimiter(
+  'users.login',
+  window=settings.LOGIN_RATE_LIMIT_WINDOW,
+  limits={'ip': settings.LOGIN_RATE_LIMIT_PER_IP, 'email': settings.LOGIN_RATE_LIMIT_PER_EMAIL},
+)
+signup_rate_limiter = RateLimiter(
+  'users.signup',
+  window=settings.SIGNUP_RATE_LIMIT_WINDOW,
+  limits={'ip': settings.SIGNUP_RATE_LIMIT_PER_IP, 'email': settings.SIGNUP_RATE_LIMIT_PER_EMAIL},
+)
 
 @swagger_auto_schema(
   method='post',
@@ -19,6 +31,8 @@ user_service = UserService()
 @api_view(['POST'])
 def create_user(request):
   validated_data = DTOValidator.validate(CreateUserDto, request.data)
+  # Before any database or bcrypt work
+  signup_rate_limiter.check(ip=client_ip(request), email=validated_data['email'])
   result = user_service.create_user(validated_data)
   return Response(result, status=status.HTTP_201_CREATED)
 
@@ -31,5 +45,7 @@ def create_user(request):
 @api_view(['POST'])
 def login(request):
   validated_data = DTOValidator.validate(EmailPasswordDto, request.data)
+  # Before any database or bcrypt work
+  login_rate_limiter.check(ip=client_ip(request), email=validated_data['email'])
   result = user_service.login(validated_data)
   return Response(result, status=status.HTTP_200_OK)
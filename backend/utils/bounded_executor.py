@@ -0,0 +1,75 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from utils.exceptions import ServiceUnavailableException
+from utils.metrics import metrics
+
+
+class BoundedExecutor:
+    """
+    Fixed-size worker pool with a bounded queue, for CPU-heavy work that must not
+    occupy every request thread at once (e.g. bcrypt).
+
+    At most max_workers calls run at a time; up to max_queue more wait for a worker.
+    Beyond that, run() fails fast with ServiceUnavailableException (503 with
+    Retry-After) instead of queueing without limit. The pool is created lazily and
+    recreated after fork, so each worker process gets its own threads.
+    With max_workers=0, calls run inline on the caller's thread.
+
+    Metrics: <name>.rejected (counter), <name>.in_flight (gauge, running + queued)
+
+    Usage:
+        executor = BoundedExecutor('password_hash', max_workers=2, max_queue=32)
+        hashed = executor.run(bcrypt.hashpw, password, salt)
+    """
+
+    def __init__(self, name, max_workers, max_queue, retry_after=1):
+        """
+        Args:
+            name: Metric prefix and thread name prefix
+            max_workers: Calls running at once (0 to run inline)
+            max_queue: Calls allowed to wait for a worker before rejecting
+            retry_after: Seconds sent in Retry-After when rejecting
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue) if max_workers > 0 else None
+        self._in_flight = 0
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._rejected = metrics.counter(f'{name}.rejected')
+        metrics.gauge(f'{name}.in_flight', lambda: self._in_flight)
+
+    def run(self, func, *args, **kwargs):
+        """
+        Run func(*args, **kwargs) on the pool and wait for its result.
+
+        Raises:
+            ServiceUnavailableException: If max_workers calls are running and max_queue are waiting
+        """
+        if self._slots is None:
+            return func(*args, **kwargs)
+
+        if not self._slots.acquire(blocking=False):
+            self._rejected.incr()
+            raise ServiceUnavailableException('Server is busy, please retry shortly.', retry_after=self.retry_after)
+        with self._lock:
+            self._in_flight += 1
+        try:
+            return self._get_executor().submit(func, *args, **kwargs).result()
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+    def _get_executor(self):
+        pid = os.getpid()
+        if self._executor is None or self._pid != pid:
+            with self._lock:
+                if self._executor is None or self._pid != pid:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name)
+                    self._pid = pid
+        return self._executor
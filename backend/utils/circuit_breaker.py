@@ -0,0 +1,176 @@
+import math
+import threading
+import time
+from utils.metrics import metrics
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# Gauge values, so dashboards can plot the state
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose circuit is open"""
+
+    def __init__(self, name, retry_after):
+        self.name = name
+        self.retry_after = retry_after
+        super().__init__(f'Circuit {name} is open, retry in {retry_after}s')
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker around calls to a flaky dependency.
+
+    closed: calls go through; failure_threshold consecutive failures open the circuit.
+    open: calls fail immediately with CircuitOpenError for recovery_timeout seconds.
+    half_open: up to half_open_max_calls trial calls go through; a success closes
+               the circuit, a failure opens it again. A trial call that is cancelled
+               (or otherwise interrupted) counts as neither and frees its slot.
+
+    State is per process and exposed as the '<name>.breaker.state' gauge
+    (0 closed, 1 half open, 2 open) with opened/rejected counters.
+
+    Usage:
+        breaker = CircuitBreaker('google_books', failure_threshold=5, recovery_timeout=30)
+        data = breaker.call(lambda: client.get(...))
+        data = await breaker.acall(lambda: async_client.get(...))
+    """
+
+    def __init__(self, name, failure_threshold=5, recovery_timeout=30, half_open_max_calls=1, is_failure=None):
+        """
+        Args:
+            name: Name used in errors and metrics
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds the circuit stays open before trial calls
+            half_open_max_calls: Concurrent trial calls allowed while half open
+            is_failure: Optional predicate on a raised exception; exceptions it
+                        rejects (e.g. client errors) pass through without counting
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.is_failure = is_failure or (lambda e: True)
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_calls = 0
+        self._lock = threading.Lock()
+        self.opened = metrics.counter(f'{name}.breaker.opened')
+        self.rejected = metrics.counter(f'{name}.breaker.rejected')
+        metrics.gauge(f'{name}.breaker.state', lambda: STATE_VALUES[self.state])
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def call(self, func):
+        """
+        Args:
+            func: Zero-argument callable calling the dependency
+
+        Returns:
+            The result of func
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+            Any exception raised by func
+        """
+        trial = self._before_call()
+        try:
+            result = func()
+        except Exception as e:
+            if self.is_failure(e):
+                self._on_failure()
+            else:
+                self._on_success()
+            raise
+        except BaseException:
+            # Interrupted (e.g. KeyboardInterrupt): neither a success nor a failure
+            self._release_trial(trial)
+            raise
+        self._on_success()
+        return result
+
+    async def acall(self, func):
+        """
+        Async variant of call(), sharing the same state.
+
+        Args:
+            func: Zero-argument callable returning an awaitable that calls the dependency
+        """
+        trial = self._before_call()
+        try:
+            result = await func()
+        except Exception as e:
+            if self.is_failure(e):
+                self._on_failure()
+            else:
+                self._on_success()
+            raise
+        except BaseException:
+            # Cancelled: neither a success nor a failure
+            self._release_trial(trial)
+            raise
+        self._on_success()
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._trial_calls = 0
+
+    def _current_state(self):
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = HALF_OPEN
+            self._trial_calls = 0
+        return self._state
+
+    def _before_call(self):
+        """Let a call through or raise CircuitOpenError; returns the trial it started while half open, else None"""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return None
+            if state == HALF_OPEN and self._trial_calls < self.half_open_max_calls:
+                self._trial_calls += 1
+                # Identifies this half-open period, in case the slot is given back after it ended
+                return self._opened_at
+            if state == OPEN:
+                retry_after = self.recovery_timeout - (time.monotonic() - self._opened_at)
+            else:
+                # Trial calls in flight decide soon
+                retry_after = 1
+        self.rejected.incr()
+        raise CircuitOpenError(self.name, max(1, math.ceil(retry_after)))
+
+    def _release_trial(self, trial):
+        """Give back the trial slot of a call that ended without an outcome, so the next call can try"""
+        if trial is None:
+            return
+        with self._lock:
+            if self._state == HALF_OPEN and self._opened_at == trial and self._trial_calls > 0:
+                self._trial_calls -= 1
+
+    def _on_success(self):
+        with self._lock:
+            # A slow call that started before the circuit opened does not close it
+            if self._state == OPEN:
+                return
+            self._state = CLOSED
+            self._failures = 0
+
+    def _on_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self.opened.incr()
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._trial_calls = 0
@@ -0,0 +1,85 @@
+from django.db import connections
+from django.db.models import sql
+
+
+def update_returning(queryset, values, fields):
+    """
+    Run queryset.update(**values) and read back the updated rows in the same statement.
+
+    Django's update() only returns a row count, so reading the new state needs a
+    second SELECT. This compiles the same UPDATE and appends RETURNING, which both
+    PostgreSQL and SQLite (3.35+) support, then converts the returned columns the
+    way the ORM would.
+
+    Args:
+        queryset: Queryset selecting the rows to update (filters on local fields only)
+        values: Dictionary of field name -> new value, as for queryset.update()
+        fields: Model field names to return for each updated row
+
+    Returns:
+        list[dict]: One dictionary per updated row, keyed by field name (attname for foreign keys)
+
+    Usage:
+        rows = update_returning(Book.objects.filter(id=1), {'price': 10}, ['id', 'price'])
+    """
+    model = queryset.model
+    connection = connections[queryset.db]
+
+    query = queryset.query.chain(sql.UpdateQuery)
+    query.add_update_values(values)
+    compiler = query.get_compiler(queryset.db)
+    update_sql, params = compiler.as_sql()
+    if not update_sql:
+        return []
+
+    columns = [model._meta.get_field(name).get_col(model._meta.db_table) for name in fields]
+    returning = ', '.join(connection.ops.quote_name(column.target.column) for column in columns)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'{update_sql} RETURNING {returning}', params)
+        rows = cursor.fetchall()
+
+    converters = compiler.get_converters(columns)
+    keys = [column.target.attname for column in columns]
+    return [dict(zip(keys, row)) for row in compiler.apply_converters(rows, converters)]
+
+
+# SQLSTATE of a unique violation on PostgreSQL
+UNIQUE_VIOLATION = '23505'
+
+
+def is_unique_violation(error, model, field_name):
+    """
+    Whether an IntegrityError is a violation of the unique constraint on one model field.
+
+    On PostgreSQL it compares the constraint name the driver reports (psycopg's
+    error.diag) with the name PostgreSQL gives a column's UNIQUE constraint,
+    <table>_<column>_key. SQLite reports no constraint name, so there it compares
+    the table.column list of the UNIQUE failure. Anything else (another constraint,
+    a NOT NULL or foreign key violation, an unknown driver) is not a match.
+
+    Args:
+        error: IntegrityError raised by the ORM
+        model: Model class owning the field
+        field_name: Name of the field declared with unique=True
+
+    Usage:
+        except IntegrityError as e:
+            if is_unique_violation(e, Book, 'isbn'):
+                raise ConflictException('Book with this ISBN already exists')
+            raise
+    """
+    table = model._meta.db_table
+    column = model._meta.get_field(field_name).column
+    cause = error.__cause__
+
+    diag = getattr(cause, 'diag', None)
+    if diag is not None:
+        return diag.sqlstate == UNIQUE_VIOLATION and diag.constraint_name == f'{table}_{column}_key'
+
+    if getattr(cause, 'sqlite_errorname', None) == 'SQLITE_CONSTRAINT_UNIQUE':
+        # e.g. "UNIQUE constraint failed: books.isbn"
+        columns = str(cause).partition(':')[2].split(',')
+        return [name.strip() for name in columns] == [f'{table}.{column}']
+
+    return False
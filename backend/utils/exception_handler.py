@@ -12,13 +12,15 @@ def custom_exception_handler(exc, context):
     Custom exception handler for DRF that handles custom exceptions
     and formats error responses consistently with only message and error fields
     """
-    # Log the exception
+    # Log the exception, with a traceback unless its class logs below ERROR (e.g. rate limit rejections)
     request = context.get('request', None)
     view = context.get('view', None)
+    level = getattr(exc, 'log_level', logging.ERROR)
 
-    logger.error(
+    logger.log(
+        level,
         f'Exception occurred: {type(exc).__name__} - {str(exc)}',
-        exc_info=exc,
+        exc_info=exc if level >= logging.ERROR else None,
         extra={
             'exception_type': type(exc).__name__,
             'exception_message': str(exc),
@@ -41,7 +43,10 @@ def custom_exception_handler(exc, context):
         if hasattr(exc, 'error') and exc.error is not None:
             custom_response_data['error'] = exc.error
 
-        return Response(custom_response_data, status=exc.status_code)
+        response = Response(custom_response_data, status=exc.status_code)
+        if getattr(exc, 'retry_after', None) is not None:
+            response['Retry-After'] = str(exc.retry_after)
+        return response
 
     # If response is None, it's an unhandled exception
     if response is None:
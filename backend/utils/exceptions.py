@@ -1,3 +1,4 @@
+import logging
 from rest_framework import status
 from rest_framework.exceptions import APIException
 import requests
@@ -50,6 +51,39 @@ class ForbiddenException(BaseAPIException):
     default_code = 'forbidden'
 
 
+class MethodNotAllowedException(BaseAPIException):
+    """405 Method Not Allowed - HTTP method not supported by the route"""
+    status_code = status.HTTP_405_METHOD_NOT_ALLOWED
+    default_detail = 'Method not allowed.'
+    default_code = 'method_not_allowed'
+
+
+class TooManyRequestsException(BaseAPIException):
+    """429 Too Many Requests - Rate limit exceeded, retry later"""
+    status_code = status.HTTP_429_TOO_MANY_REQUESTS
+    default_detail = 'Too many requests.'
+    default_code = 'too_many_requests'
+    # Expected under attack bursts, logged without a traceback so they do not flood the error log
+    log_level = logging.WARNING
+
+    def __init__(self, detail=None, code=None, status_code=None, error=None, retry_after=None):
+        # Seconds until the limit allows another request, sent as the Retry-After header
+        self.retry_after = retry_after
+        super().__init__(detail, code, status_code, error)
+
+
+class ServiceUnavailableException(BaseAPIException):
+    """503 Service Unavailable - Dependency temporarily unavailable, retry later"""
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Service temporarily unavailable.'
+    default_code = 'service_unavailable'
+
+    def __init__(self, detail=None, code=None, status_code=None, error=None, retry_after=None):
+        # Seconds until a retry may succeed, sent as the Retry-After header
+        self.retry_after = retry_after
+        super().__init__(detail, code, status_code, error)
+
+
 class ExternalAPIException(BaseAPIException):
     """Exception for external API request failures"""
     status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -0,0 +1,66 @@
+import math
+import threading
+import time
+
+
+class FrequencyTracker:
+    """
+    Thread-safe tracker of the most frequently seen keys, with bounded memory.
+
+    Counts decay exponentially with the given half-life, so keys that were
+    popular a while ago give way to what is popular now. When more than
+    max_keys are tracked, the lowest-scoring tenth is dropped.
+    Each key can carry a payload (the latest one recorded is kept).
+
+    Usage:
+        tracker = FrequencyTracker(max_keys=1000, half_life=3600)
+        tracker.record('key', payload)
+        tracker.top(10)
+    """
+
+    def __init__(self, max_keys=1000, half_life=3600):
+        """
+        Args:
+            max_keys: Maximum number of keys tracked
+            half_life: Seconds after which a recorded hit counts half
+        """
+        self.max_keys = max_keys
+        self.half_life = half_life
+        self._entries = {}  # key -> [score, updated_at, payload]
+        self._lock = threading.Lock()
+
+    def record(self, key, payload=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._entries[key] = [1.0, now, payload]
+                if len(self._entries) > self.max_keys:
+                    self._evict(now)
+            else:
+                entry[0] = self._decayed(entry, now) + 1
+                entry[1] = now
+                entry[2] = payload
+
+    def top(self, n) -> list:
+        """
+        Returns:
+            list: Up to n (key, payload, score) tuples, most frequent first
+        """
+        now = time.monotonic()
+        with self._lock:
+            scored = [(key, entry[2], self._decayed(entry, now)) for key, entry in self._entries.items()]
+        scored.sort(key=lambda item: item[2], reverse=True)
+        return scored[:n]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _decayed(self, entry, now):
+        score, updated_at, _ = entry
+        return score * math.pow(0.5, (now - updated_at) / self.half_life)
+
+    def _evict(self, now):
+        keep = sorted(self._entries, key=lambda key: self._decayed(self._entries[key], now), reverse=True)
+        for key in keep[int(self.max_keys * 0.9):]:
+            del self._entries[key]
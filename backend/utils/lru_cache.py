@@ -0,0 +1,105 @@
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Thread-safe in-process LRU cache with per-entry TTL, bounded by entry count and/or memory.
+
+    Entry size is estimated from the pickled value, so max_bytes bounds the memory
+    held by cached values regardless of how large individual entries are.
+    Least recently used entries are evicted first.
+
+    Usage:
+        cache = LRUCache(max_bytes=32 * 1024 * 1024, ttl=60)
+        cache.set('key', value)
+        cache.get('key')
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None, ttl=None):
+        """
+        Args:
+            max_entries: Maximum number of entries (None for no limit)
+            max_bytes: Maximum total estimated size of cached values in bytes (None for no limit)
+            ttl: Default time to live in seconds (None for no expiry)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (value, size, expires_at)
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Return the cached value, or default if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            value, _, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        """
+        Cache a value. Values larger than max_bytes on their own are not cached.
+
+        Args:
+            key: Hashable key
+            value: Picklable value
+            ttl: Time to live in seconds (default: the cache's ttl)
+        """
+        size = self._sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, expires_at)
+            self._size += size
+            self._evict()
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size_bytes(self):
+        return self._size
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._size -= size
+
+    def _evict(self):
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries) or
+            (self.max_bytes is not None and self._size > self.max_bytes)
+        ):
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+
+    @staticmethod
+    def _sizeof(value):
+        try:
+            return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            return 0
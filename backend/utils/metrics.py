@@ -0,0 +1,70 @@
+import threading
+
+
+class Counter:
+    """Thread-safe monotonically increasing counter"""
+
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def incr(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self):
+        return self._value
+
+
+class MetricsRegistry:
+    """
+    In-process registry of named counters and gauges.
+
+    Counters are incremented by the code that owns them; gauges are callables
+    evaluated when a snapshot is taken (e.g. current cache size, breaker state).
+    Values are per worker process.
+
+    Usage:
+        hits = metrics.counter('books.detail_cache.hits')
+        hits.incr()
+        metrics.gauge('books.detail_cache.hit_rate', lambda: ...)
+        metrics.snapshot()
+    """
+
+    def __init__(self):
+        self._counters = {}
+        self._gauges = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name) -> Counter:
+        with self._lock:
+            if name not in self._counters:
+                self._counters[name] = Counter()
+            return self._counters[name]
+
+    def gauge(self, name, func):
+        with self._lock:
+            self._gauges[name] = func
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+
+        values = {name: counter.value for name, counter in counters.items()}
+        for name, func in gauges.items():
+            try:
+                values[name] = func()
+            except Exception:
+                values[name] = None
+        return dict(sorted(values.items()))
+
+
+def hit_rate(hits: Counter, misses: Counter):
+    """Ratio of hits to lookups, or None before the first lookup"""
+    total = hits.value + misses.value
+    return round(hits.value / total, 4) if total else None
+
+
+metrics = MetricsRegistry()
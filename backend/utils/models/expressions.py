@@ -0,0 +1,70 @@
+from django.db.models import BooleanField, Expression, F, Value
+
+
+class RowCompare(Expression):
+    """
+    Row-value comparison (col1, col2, ...) < (v1, v2, ...) usable in filter().
+
+    Unlike the equivalent OR chain (col1 < v1 OR (col1 = v1 AND col2 < v2)),
+    PostgreSQL turns a row comparison into a single index range condition on a
+    B-tree index over the same columns, so a keyset page is read starting at the
+    boundary row instead of from the start of the index.
+
+    Values are converted with the output field of the matching column or
+    annotation when the expression is resolved, so an unparseable value raises
+    ValidationError from filter() rather than from the database.
+
+    Usage:
+        Book.objects.filter(RowCompare(['created_at', 'id'], '<', [created_at, id]))
+    """
+
+    output_field = BooleanField()
+    operators = ('<', '>', '<=', '>=')
+
+    def __init__(self, fields, operator, values):
+        """
+        Args:
+            fields: Field or annotation names (or expressions), in index order
+            operator: One of <, >, <=, >=
+            values: Values to compare with, one per field
+        """
+        if operator not in self.operators:
+            raise ValueError(f'Unsupported row comparison operator: {operator}')
+        if len(fields) != len(values):
+            raise ValueError('Row comparison needs one value per field')
+        super().__init__()
+        self.operator = operator
+        self.lhs = [F(field) if isinstance(field, str) else field for field in fields]
+        self.rhs = list(values)
+
+    def get_source_expressions(self):
+        return [*self.lhs, *self.rhs]
+
+    def set_source_expressions(self, exprs):
+        self.lhs = exprs[:len(self.lhs)]
+        self.rhs = exprs[len(self.lhs):]
+
+    def resolve_expression(self, query=None, allow_joins=True, reuse=None, summarize=False, for_save=False):
+        clone = self.copy()
+        clone.is_summary = summarize
+        clone.lhs = [expression.resolve_expression(query, allow_joins, reuse, summarize, for_save) for expression in self.lhs]
+        rhs = []
+        for column, value in zip(clone.lhs, self.rhs):
+            if not hasattr(value, 'resolve_expression'):
+                field = column.output_field
+                value = Value(field.to_python(value), output_field=field)
+            rhs.append(value.resolve_expression(query, allow_joins, reuse, summarize, for_save))
+        clone.rhs = rhs
+        return clone
+
+    def as_sql(self, compiler, connection):
+        lhs_sql, rhs_sql, params = [], [], []
+        for column in self.lhs:
+            sql, column_params = compiler.compile(column)
+            lhs_sql.append(sql)
+            params.extend(column_params)
+        for value in self.rhs:
+            sql, value_params = compiler.compile(value)
+            rhs_sql.append(sql)
+            params.extend(value_params)
+        return f"({', '.join(lhs_sql)}) {self.operator} ({', '.join(rhs_sql)})", params
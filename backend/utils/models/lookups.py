@@ -0,0 +1,59 @@
+from django.core.exceptions import EmptyResultSet
+from django.db.models import CharField, Field, TextField
+from django.db.models.lookups import In, PatternLookup
+
+
+@CharField.register_lookup
+@TextField.register_lookup
+class TrigramContains(PatternLookup):
+    """
+    Case-insensitive substring match that a pg_trgm GIN index can serve.
+
+    Django's built-in icontains compiles to UPPER(col) LIKE UPPER(%s) on PostgreSQL,
+    which no plain column index can answer. This lookup compiles to col ILIKE %s
+    instead, so a GIN index with gin_trgm_ops on the column is used.
+    Other backends fall back to LIKE, which SQLite already treats as case-insensitive.
+
+    Usage:
+        Book.objects.filter(title__trigram_icontains='potter')
+    """
+
+    lookup_name = 'trigram_icontains'
+
+    def as_sql(self, compiler, connection):
+        lhs_sql, lhs_params = self.process_lhs(compiler, connection)
+        rhs_sql, rhs_params = self.process_rhs(compiler, connection)
+        operator = 'ILIKE' if connection.vendor == 'postgresql' else 'LIKE'
+        return f"{lhs_sql} {operator} {rhs_sql} ESCAPE '\\'", [*lhs_params, *rhs_params]
+
+    def process_lhs(self, compiler, connection, lhs=None):
+        # Compile the bare column, without the UPPER() cast BuiltinLookup adds for icontains
+        return compiler.compile(self.lhs if lhs is None else lhs)
+
+
+@Field.register_lookup
+class AnyLookup(In):
+    """
+    Membership test that binds the whole list as a single array parameter.
+
+    On PostgreSQL this compiles to col = ANY(%s), so a batch of thousands of values
+    is sent as one array instead of one placeholder per value, and the statement
+    text stays the same whatever the batch size. Other backends fall back to IN.
+
+    Usage:
+        Book.objects.filter(isbn__any=['9780261103573', '9780007525546'])
+        Book.objects.filter(id__any=[1, 2, 3])
+    """
+
+    lookup_name = 'any'
+
+    def as_postgresql(self, compiler, connection):
+        if not self.rhs_is_direct_value():
+            return super().as_sql(compiler, connection)
+
+        values = list(dict.fromkeys(value for value in self.rhs if value is not None))
+        if not values:
+            raise EmptyResultSet
+
+        lhs_sql, lhs_params = self.process_lhs(compiler, connection)
+        return f'{lhs_sql} = ANY(%s)', [*lhs_params, values]
@@ -0,0 +1,41 @@
+from django.db.migrations.operations.base import Operation
+
+
+class PostgreSQLOnly(Operation):
+    """
+    Wrap a migration operation so it only touches the database on PostgreSQL.
+
+    The model state is always updated, so the autodetector stays in sync,
+    but on other backends (e.g. SQLite test runs) the schema change is skipped.
+    Use it for PostgreSQL-specific DDL such as extensions, GIN indexes and triggers.
+
+    Usage:
+        PostgreSQLOnly(TrigramExtension())
+        PostgreSQLOnly(migrations.AddIndex('book', GinIndex(...)))
+    """
+
+    reversible = True
+
+    def __init__(self, operation):
+        self.operation = operation
+
+    def deconstruct(self):
+        return (self.__class__.__qualname__, [self.operation], {})
+
+    def state_forwards(self, app_label, state):
+        self.operation.state_forwards(app_label, state)
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            self.operation.database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            self.operation.database_backwards(app_label, schema_editor, from_state, to_state)
+
+    def describe(self):
+        return f'{self.operation.describe()} (PostgreSQL only)'
+
+    @property
+    def migration_name_fragment(self):
+        return self.operation.migration_name_fragment
@@ -0,0 +1,114 @@
+import base64
+import json
+from datetime import datetime
+from django.core.exceptions import ValidationError
+from utils.exceptions import BadRequestException
+from utils.models.expressions import RowCompare
+
+
+class KeysetPaginator:
+    """
+    Keyset (cursor) pagination over a fixed descending ordering.
+
+    Pages are selected with a WHERE clause on the ordering keys of the last
+    row seen instead of OFFSET, so deep pages cost the same as the first one
+    and rows inserted during the walk never shift or duplicate results.
+
+    Cursors are opaque URL-safe base64 strings holding the key values of the
+    boundary row and the walk direction ('next' or 'prev').
+
+    Usage:
+        paginator = KeysetPaginator(['created_at', 'id'])
+        page = paginator.paginate(queryset, cursor=filters.get('cursor'), limit=20)
+    """
+
+    def __init__(self, keys):
+        """
+        Args:
+            keys: Field names (or annotations) the queryset is ordered by, all descending.
+                  The last key must be unique (e.g. 'id') to make the ordering total.
+        """
+        self.keys = list(keys)
+
+    def paginate(self, queryset, cursor=None, limit=20) -> dict:
+        """
+        Return one page of the queryset.
+
+        Args:
+            queryset: A values() queryset containing every ordering key
+            cursor: Opaque cursor from a previous page (optional)
+            limit: Maximum number of rows in the page
+
+        Returns:
+            dict: {'results': [...], 'next': cursor or None, 'prev': cursor or None}
+
+        Raises:
+            BadRequestException: If the cursor is malformed
+        """
+        direction = 'next'
+        if cursor:
+            direction, values = self.decode_cursor(cursor)
+            try:
+                queryset = queryset.filter(self._seek_filter(values, direction))
+            except (ValidationError, ValueError, TypeError):
+                raise BadRequestException('Invalid cursor')
+
+        if direction == 'prev':
+            ordering = self.keys
+        else:
+            ordering = [f'-{key}' for key in self.keys]
+
+        # Fetch one extra row to know whether another page exists
+        rows = list(queryset.order_by(*ordering)[:limit + 1])
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        if direction == 'prev':
+            rows.reverse()
+            has_next = bool(cursor)
+            has_prev = has_more
+        else:
+            has_next = has_more
+            has_prev = bool(cursor)
+
+        return {
+            'results': rows,
+            'next': self.encode_cursor(rows[-1], 'next') if rows and has_next else None,
+            'prev': self.encode_cursor(rows[0], 'prev') if rows and has_prev else None,
+        }
+
+    def encode_cursor(self, row, direction) -> str:
+        values = [self._encode_value(row[key]) for key in self.keys]
+        raw = json.dumps({'d': direction, 'v': values}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            direction = data['d']
+            values = data['v']
+        except (ValueError, TypeError, KeyError, UnicodeError):
+            raise BadRequestException('Invalid cursor')
+
+        if direction not in ('next', 'prev') or not isinstance(values, list) or len(values) != len(self.keys):
+            raise BadRequestException('Invalid cursor')
+
+        return direction, values
+
+    def _seek_filter(self, values, direction) -> RowCompare:
+        """
+        Build the row-value comparison (k1, k2, ...) < (v1, v2, ...), or > when walking back.
+        PostgreSQL uses it as a single Index Cond on an index over the keys, so the scan
+        starts at the boundary row; the equivalent OR chain would only be a Filter.
+        """
+        return RowCompare(self.keys, '<' if direction == 'next' else '>', values)
+
+    @staticmethod
+    def _encode_value(value):
+        # Keep full microsecond precision, a truncated timestamp would skip rows
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, (int, float, str)) or value is None:
+            return value
+        return str(value)
@@ -0,0 +1,189 @@
+import hashlib
+import math
+import threading
+import time
+from django.conf import settings
+from django.core.cache import caches
+from utils.exceptions import TooManyRequestsException
+from utils.lru_cache import LRUCache
+from utils.metrics import metrics
+
+
+class LocalRateLimitStore:
+    """
+    In-process counter store. Limits apply per worker process, so with N workers
+    a client may get up to N times the configured limit.
+    Bounded to max_keys counters, least recently used evicted first.
+    """
+
+    def __init__(self, max_keys=100000):
+        self._counters = LRUCache(max_entries=max_keys)  # key -> [count]
+        self._lock = threading.Lock()
+
+    def get_many(self, keys) -> list:
+        with self._lock:
+            return [self._counters.get(key, [0])[0] for key in keys]
+
+    def incr(self, key, timeout) -> int:
+        """Add one to the counter (created with the given timeout) and return the new count, atomically"""
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None:
+                self._counters.set(key, [1], ttl=timeout)
+                return 1
+            # Incremented in place, so the expiry stays that of the window's first hit
+            counter[0] += 1
+            return counter[0]
+
+    def decr(self, key):
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is not None and counter[0] > 0:
+                counter[0] -= 1
+
+
+class CacheRateLimitStore:
+    """
+    Counter store on a Django cache alias, shared by every worker using that
+    backend (e.g. Redis or Memcached), so limits apply across the fleet.
+    """
+
+    def __init__(self, alias):
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def get_many(self, keys) -> list:
+        values = self.cache.get_many(keys)
+        return [values.get(key, 0) for key in keys]
+
+    def incr(self, key, timeout) -> int:
+        """Add one to the counter (created with the given timeout) and return the new count, atomically"""
+        cache = self.cache
+        cache.add(key, 0, timeout)
+        try:
+            return cache.incr(key)
+        except ValueError:
+            # Expired or evicted between add() and incr()
+            cache.set(key, 1, timeout)
+            return 1
+
+    def decr(self, key):
+        try:
+            self.cache.decr(key)
+        except ValueError:
+            pass
+
+
+class RateLimiter:
+    """
+    Sliding-window rate limiter with one limit per key kind (e.g. client IP and email).
+
+    Counts requests in fixed windows and estimates the rate over the last window
+    as the current count plus the previous window's count weighted by how much of
+    it still overlaps. This smooths the burst a plain fixed window allows at its
+    boundary and needs only two counters per key, which any cache backend can hold.
+
+    The current window's counter is the gate: check() increments it atomically
+    and compares the returned count, so concurrent requests cannot all pass on
+    the same reading. Over the limit, it takes the increment back (rejected
+    requests do not extend the block) and raises TooManyRequestsException
+    (429 with Retry-After). Rejections are counted in <name>.rejected.<kind>.
+
+    Usage:
+        limiter = RateLimiter('users.login', window=60, limits={'ip': 20, 'email': 10})
+        limiter.check(ip=client_ip(request), email=dto['email'])
+    """
+
+    def __init__(self, name, window, limits, store=None):
+        """
+        Args:
+            name: Counter key prefix and metric prefix
+            window: Window length in seconds
+            limits: Requests allowed per window, by key kind (0 disables that kind)
+            store: Counter store (default: RATE_LIMIT_CACHE alias if set, else in-process)
+        """
+        self.name = name
+        self.window = window
+        self.limits = limits
+        self.store = store or default_store()
+        self._rejected = {kind: metrics.counter(f'{name}.rejected.{kind}') for kind in limits}
+
+    def check(self, **keys):
+        """
+        Count one request for each given key, or reject it if any key is over its limit.
+
+        Args:
+            **keys: Key value by kind, e.g. ip='203.0.113.7', email='a@b.c' (None values are skipped)
+
+        Raises:
+            TooManyRequestsException: If a key has reached its limit in the current window
+        """
+        now = time.time()
+        index, offset = divmod(now, self.window)
+        index = int(index)
+        previous_weight = 1 - offset / self.window
+
+        checked = [
+            (kind, self._key(kind, value))
+            for kind, value in keys.items()
+            if value is not None and self.limits.get(kind)
+        ]
+        if not checked:
+            return
+
+        # The previous window is over, so its counts can no longer change
+        previous_counts = self.store.get_many([f'{key}:{index - 1}' for _, key in checked])
+
+        counted = []
+        try:
+            for (kind, key), previous in zip(checked, previous_counts):
+                # Kept for two windows, so it is still readable as the previous window
+                current = self.store.incr(f'{key}:{index}', 2 * self.window)
+                counted.append(key)
+                if current + previous * previous_weight > self.limits[kind]:
+                    self._rejected[kind].incr()
+                    raise TooManyRequestsException(
+                        'Too many requests, please retry later.',
+                        retry_after=max(1, math.ceil(self.window - offset))
+                    )
+        except TooManyRequestsException:
+            for key in counted:
+                self.store.decr(f'{key}:{index}')
+            raise
+
+    def _key(self, kind, value):
+        # Digest keeps keys short and safe for any cache backend, and keeps emails out of it
+        digest = hashlib.sha256(str(value).strip().lower().encode('utf-8')).hexdigest()[:32]
+        return f'ratelimit:{self.name}:{kind}:{digest}'
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def default_store():
+    """The store named by RATE_LIMIT_CACHE (a cache alias), or a shared in-process store when it is empty"""
+    global _default_store
+    if settings.RATE_LIMIT_CACHE:
+        return CacheRateLimitStore(settings.RATE_LIMIT_CACHE)
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = LocalRateLimitStore(settings.RATE_LIMIT_LOCAL_MAX_KEYS)
+        return _default_store
+
+
+def client_ip(request):
+    """
+    Client address of the request. With RATE_LIMIT_TRUSTED_PROXIES = n > 0, it is the
+    n-th address from the right of X-Forwarded-For (the one the outermost trusted
+    proxy saw), since addresses further left can be set by the client.
+    """
+    proxies = settings.RATE_LIMIT_TRUSTED_PROXIES
+    if proxies > 0:
+        forwarded = [part.strip() for part in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if part.strip()]
+        if len(forwarded) >= proxies:
+            return forwarded[-proxies]
+    return request.META.get('REMOTE_ADDR')
@@ -0,0 +1,277 @@
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+import uuid
+from django.core.cache import caches
+from utils.exceptions import ExternalAPIException, ServiceUnavailableException
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent calls for the same key within a process.
+
+    The first caller for a key runs the function; callers that arrive while it
+    is running wait for it and receive the same result, or the same exception.
+    Once the call finishes the key is released, so later callers run it again.
+    This keeps a cache miss on a popular key from turning into a stampede of
+    identical database or upstream requests.
+
+    Usage:
+        flight = SingleFlight()
+        result = flight.do(key, lambda: expensive_query())
+    """
+
+    def __init__(self, on_wait=None):
+        """
+        Args:
+            on_wait: Optional callable invoked each time a caller waits for another's call
+        """
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.on_wait = on_wait
+
+    def do(self, key, func):
+        """
+        Args:
+            key: Hashable key identifying identical calls
+            func: Zero-argument callable producing the result
+
+        Returns:
+            The result of func (shared between concurrent callers)
+
+        Raises:
+            Any exception raised by func (shared between concurrent callers)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            if self.on_wait is not None:
+                self.on_wait()
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+# Result handed to the waiters of a cancelled leader, telling them to call again
+_RETRY = object()
+
+
+class AsyncSingleFlight:
+    """
+    SingleFlight for coroutines: concurrent awaits for the same key within an
+    event loop share one call of the coroutine function.
+
+    Cancelling the caller running the call does not cancel its waiters: they
+    start over, and the first one becomes the new leader.
+
+    Usage:
+        flight = AsyncSingleFlight()
+        result = await flight.do(key, lambda: fetch_upstream())
+    """
+
+    def __init__(self, on_wait=None):
+        """
+        Args:
+            on_wait: Optional callable invoked each time a caller waits for another's call
+        """
+        self._calls = {}
+        self.on_wait = on_wait
+
+    async def do(self, key, func):
+        """
+        Args:
+            key: Hashable key identifying identical calls
+            func: Zero-argument callable returning an awaitable
+
+        Returns:
+            The result of the awaitable (shared between concurrent callers)
+
+        Raises:
+            Any exception raised by the awaitable (shared between concurrent callers)
+        """
+        loop = asyncio.get_running_loop()
+        call_key = (id(loop), key)
+        future = self._calls.get(call_key)
+        if future is not None:
+            if self.on_wait is not None:
+                self.on_wait()
+            # Shielded so a cancelled waiter does not cancel the call for the others
+            result = await asyncio.shield(future)
+            if result is _RETRY:
+                return await self.do(key, func)
+            return result
+
+        future = loop.create_future()
+        self._calls[call_key] = future
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            # Only this caller was cancelled, the waiters retry without it
+            future.set_result(_RETRY)
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception retrieved when nobody else was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[call_key]
+
+
+class CacheSingleFlight:
+    """
+    Deduplicate concurrent calls for the same key across processes, through a Django cache.
+
+    The caller that wins cache.add() on the lock key runs the function and
+    publishes its result under a result key for a few seconds; callers in other
+    processes poll for it until it appears. If the lock is released without a
+    published outcome, or wait_timeout passes, the waiter runs the function
+    itself, so a crashed leader never blocks anyone for longer than that. Only
+    the caller that took the lock releases it. Only useful with a backend shared
+    by the processes (Redis, Memcached, database); combine with SingleFlight so
+    that only one thread per process takes part.
+
+    Exceptions are published as an error record (status code, detail, retry
+    after) rather than pickled, and re-raised in waiters as
+    ServiceUnavailableException for a 503, else ExternalAPIException with the
+    same status code.
+
+    Usage:
+        flight = CacheSingleFlight('books', lock_timeout=15)
+        result = flight.do(key, lambda: fetch_upstream())
+    """
+
+    def __init__(self, alias, prefix='singleflight', lock_timeout=30, wait_timeout=None,
+                 poll_interval=0.05, on_wait=None):
+        """
+        Args:
+            alias: Django cache alias used for locks and results
+            prefix: Prefix of the lock and result keys
+            lock_timeout: Seconds before a lock held by a crashed leader expires
+            wait_timeout: Seconds a waiter polls before running the call itself (default: lock_timeout)
+            poll_interval: Seconds between polls
+            on_wait: Optional callable invoked each time a caller waits for another's call
+        """
+        self.alias = alias
+        self.prefix = prefix
+        self.lock_timeout = lock_timeout
+        self.wait_timeout = lock_timeout if wait_timeout is None else wait_timeout
+        self.poll_interval = poll_interval
+        self.on_wait = on_wait
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def do(self, key, func):
+        """
+        Args:
+            key: String identifying identical calls
+            func: Zero-argument callable producing a picklable result
+
+        Returns:
+            The result of func, possibly computed by another process
+
+        Raises:
+            Any exception raised by func in this process; ServiceUnavailableException
+            or ExternalAPIException for a failure published by another process
+        """
+        digest = hashlib.sha256(str(key).encode('utf-8')).hexdigest()
+        lock_key = f'{self.prefix}:lock:{digest}'
+        result_key = f'{self.prefix}:result:{digest}'
+
+        # Unique per call, so a caller never releases a lock taken by another one
+        token = uuid.uuid4().hex
+        owner = self.cache.add(lock_key, token, self.lock_timeout)
+        if not owner:
+            if self.on_wait is not None:
+                self.on_wait()
+            outcome = self._wait(lock_key, result_key)
+            if outcome is not None:
+                return self._unwrap(outcome)
+
+        try:
+            result = func()
+        except Exception as e:
+            self._publish(result_key, ('error', self._error_record(e)))
+            raise
+        else:
+            self._publish(result_key, ('ok', result))
+            return result
+        finally:
+            # Not atomic, Django's cache API has no compare-and-delete; the window is
+            # only a lock that expired and was retaken between these two calls
+            if owner and self.cache.get(lock_key) == token:
+                self.cache.delete(lock_key)
+
+    def _wait(self, lock_key, result_key):
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            outcome = self.cache.get(result_key)
+            if outcome is not None:
+                return outcome
+            if self.cache.get(lock_key) is None:
+                # The leader may have published right before releasing the lock
+                return self.cache.get(result_key)
+            time.sleep(self.poll_interval)
+        return None
+
+    def _publish(self, result_key, outcome):
+        # Long enough for pollers to see it, short enough not to act as a cache
+        try:
+            self.cache.set(result_key, outcome, max(1, int(self.poll_interval * 20)))
+        except Exception:
+            # Waiters fall back to running the call themselves
+            logger.warning('Could not publish the single-flight outcome for %s', result_key, exc_info=True)
+
+    @staticmethod
+    def _error_record(error) -> dict:
+        record = {
+            'status_code': getattr(error, 'status_code', 500),
+            'detail': str(getattr(error, 'detail', None) or error),
+            'retry_after': getattr(error, 'retry_after', None),
+        }
+        # Request/response details of ExternalAPIException, a dict of plain values
+        if isinstance(getattr(error, 'error', None), dict):
+            record['error'] = error.error
+        return record
+
+    @staticmethod
+    def _unwrap(outcome):
+        kind, value = outcome
+        if kind == 'error':
+            if value['status_code'] == ServiceUnavailableException.status_code:
+                raise ServiceUnavailableException(value['detail'], retry_after=value['retry_after'])
+            raise ExternalAPIException(value['detail'], status_code=value['status_code'], error=value.get('error'))
+        return value
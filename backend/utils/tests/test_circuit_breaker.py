@@ -0,0 +1,75 @@
+import asyncio
+from django.test import SimpleTestCase
+from utils.circuit_breaker import CLOSED, HALF_OPEN, CircuitBreaker, CircuitOpenError
+
+
+class CircuitBreakerTests(SimpleTestCase):
+
+    def setUp(self):
+        # recovery_timeout=0 makes the circuit half open as soon as it opens
+        self.breaker = CircuitBreaker('test', failure_threshold=1, recovery_timeout=0)
+
+    def _open(self):
+        with self.assertRaises(ValueError):
+            self.breaker.call(self._fail)
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+
+    @staticmethod
+    def _fail():
+        raise ValueError('down')
+
+    def test_failed_trial_call_opens_the_circuit_again(self):
+        self.breaker.recovery_timeout = 60
+        with self.assertRaises(ValueError):
+            self.breaker.call(self._fail)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.call(lambda: 'ok')
+
+    def test_successful_trial_call_closes_the_circuit(self):
+        self._open()
+        self.assertEqual(self.breaker.call(lambda: 'ok'), 'ok')
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_trial_call_rejects_concurrent_calls(self):
+        self._open()
+
+        async def run():
+            started = asyncio.Event()
+
+            async def slow():
+                started.set()
+                await asyncio.sleep(1)
+
+            trial = asyncio.create_task(self.breaker.acall(slow))
+            await started.wait()
+            with self.assertRaises(CircuitOpenError):
+                await self.breaker.acall(self._async_ok)
+            trial.cancel()
+
+        asyncio.run(run())
+
+    def test_cancelled_trial_call_frees_its_slot(self):
+        self._open()
+
+        async def run():
+            started = asyncio.Event()
+
+            async def slow():
+                started.set()
+                await asyncio.sleep(1)
+
+            trial = asyncio.create_task(self.breaker.acall(slow))
+            await started.wait()
+            trial.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await trial
+            # The cancellation counted as neither outcome, so the next call is the trial
+            self.assertEqual(self.breaker.state, HALF_OPEN)
+            return await self.breaker.acall(self._async_ok)
+
+        self.assertEqual(asyncio.run(run()), 'ok')
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    @staticmethod
+    async def _async_ok():
+        return 'ok'
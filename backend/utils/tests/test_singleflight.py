@@ -0,0 +1,44 @@
+import asyncio
+from django.test import SimpleTestCase
+from utils.singleflight import AsyncSingleFlight
+
+
+class AsyncSingleFlightTests(SimpleTestCase):
+
+    def test_waiters_share_the_leader_result(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return 'value'
+
+        async def run():
+            return await asyncio.gather(*(flight.do('key', fetch) for _ in range(5)))
+
+        self.assertEqual(asyncio.run(run()), ['value'] * 5)
+        self.assertEqual(len(calls), 1)
+
+    def test_cancelled_leader_does_not_cancel_waiters(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return 'value'
+
+        async def run():
+            leader = asyncio.create_task(flight.do('key', fetch))
+            await asyncio.sleep(0)
+            waiters = [asyncio.create_task(flight.do('key', fetch)) for _ in range(3)]
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await leader
+            return await asyncio.gather(*waiters)
+
+        self.assertEqual(asyncio.run(run()), ['value'] * 3)
+        # The cancelled call and a single retry by the first waiter
+        self.assertEqual(len(calls), 2)
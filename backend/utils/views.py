@@ -0,0 +1,20 @@
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework import status
+from drf_yasg.utils import swagger_auto_schema
+from decorators.roles import roles
+from user.models import UserRole
+from utils.metrics import metrics
+
+@roles([UserRole.ADMIN])
+def get_metrics(request):
+    return Response(metrics.snapshot(), status=status.HTTP_200_OK)
+
+@swagger_auto_schema(
+    method='get',
+    operation_summary="Get in-process metrics (cache hit rates, counters) of the serving worker",
+    responses={200: 'Metric name to value'}
+)
+@api_view(['GET'])
+def metrics_view(request):
+    return get_metrics(request)